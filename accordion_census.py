@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+코퍼스 전체 아코디언/FAQ 구현 변형 조사 (census)
+
+ACCORDION_PATTERN_ANALYSIS.md, FAQ_PATTERN_ANALYSIS_DETAILED.md 에서 손으로 정리한
+변형 분류를 모든 페이지에 자동으로 적용합니다. 페이지마다 태그를 한 번만 훑어
+변형별 표시 요소 수와 아직 접혀 있는 요소 수를 세고, 알려진 변형에 맞지 않지만
+아코디언처럼 보이는 페이지는 단서(class 이름 등)와 함께 따로 보고합니다.
+파일은 여러 프로세스에서 나누어 분류하며, 결과는 JSON 과 Markdown 보고서로 씁니다.
+"""
+
+import json
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor
+from typing import Dict, List
+
+# 루트 폴더 기준 기본 출력 위치
+CENSUS_DIR = os.path.join('.kstation', 'census')
+CENSUS_JSON = 'accordion_census.json'
+CENSUS_MARKDOWN = 'ACCORDION_CENSUS.md'
+
+# 변형별 보고서 표시 이름과 이 변형을 펼치는 kstation 규칙 키
+# (요소/접힌 요소를 세는 기준은 classify_content 참고)
+VARIANTS: Dict[str, dict] = {
+    'details': {
+        'label': '`<details>`',
+        'rules': ['details'],
+    },
+    'ac_item': {
+        'label': '`.kst-ac-item` + `aria-expanded`',
+        'rules': ['ac_items', 'aria_expanded', 'ac_panel'],
+    },
+    'faq_active': {
+        'label': '`.kst-faq` + `.kst-active`',
+        'rules': ['faq_items', 'faq_active'],
+    },
+    'faq_question': {
+        'label': '`.kst-faq-question`',
+        'rules': ['faq_question', 'faq_answer'],
+    },
+    'faq_item_open': {
+        'label': '`.kst-faq-item` + `.kst-open`',
+        'rules': ['faq_item_open'],
+    },
+}
+
+TAG_PATTERN = re.compile(r'<(/?)([a-zA-Z][a-zA-Z0-9-]*)\b([^>]*)>')
+CLASS_PATTERN = re.compile(r'\bclass\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+OPEN_ATTR_PATTERN = re.compile(r'(?:^|\s)open(?:\s|=|/|$)', re.IGNORECASE)
+ARIA_EXPANDED_PATTERN = re.compile(r'\baria-expanded\s*=', re.IGNORECASE)
+
+# 닫는 태그가 없어 열린 요소 스택에 올리지 않는 태그
+VOID_ELEMENTS = {'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input', 'link', 'meta',
+                 'param', 'source', 'track', 'wbr'}
+
+# 알려진 변형이 없을 때 아코디언 구현으로 의심할 class 이름
+HINT_PATTERN = re.compile(r'accordion|faq|toggle|collaps|dropdown|ac-item|ac-panel|\bqa\b|-qa\b',
+                          re.IGNORECASE)
+
+
+def classify_content(content: str) -> dict:
+    """페이지 하나의 변형 분류
+
+    변형마다 표시 요소(details 태그, kst-ac-item, kst-faq, kst-faq-question, kst-faq-item)를
+    세고, 펼침 상태를 가진 요소(details, kst-ac-panel, kst-faq, kst-faq-answer,
+    kst-faq-item)에 펼침 표시(open, kst-show, kst-active, kst-open)가 없으면 접힌 것으로 셉니다.
+    kst-faq-answer 는 `.kst-faq.kst-active .kst-faq-answer` 처럼 부모 kst-faq 의 kst-active 로
+    펼치는 페이지도 있으므로, 펼쳐진 kst-faq 안에 있으면 펼친 것으로 봅니다.
+
+    반환값: {'variants': [변형 키], 'items': {변형: 요소 수}, 'closed': {변형: 접힌 수},
+             'hints': [단서]}
+    """
+    items = {key: 0 for key in VARIANTS}
+    closed = {key: 0 for key in VARIANTS}
+    hints = set()
+    # 열린 요소 스택 [(태그, 펼쳐진 kst-faq 인지)] 과 그중 펼쳐진 kst-faq 수
+    open_elements = []
+    open_faqs = 0
+
+    for match in TAG_PATTERN.finditer(content):
+        name = match.group(2).lower()
+        attrs = match.group(3)
+        if match.group(1):
+            # 닫는 태그 - 짝이 되는 요소까지 (닫히지 않은 자식 포함) 스택에서 제거
+            for depth in range(len(open_elements) - 1, -1, -1):
+                if open_elements[depth][0] == name:
+                    open_faqs -= sum(faq_open for _, faq_open in open_elements[depth:])
+                    del open_elements[depth:]
+                    break
+            continue
+        class_match = CLASS_PATTERN.search(attrs)
+        classes = set(class_match.group(1).split()) if class_match else set()
+
+        if ARIA_EXPANDED_PATTERN.search(attrs):
+            hints.add('aria-expanded')
+        if name == 'details':
+            items['details'] += 1
+            closed['details'] += not OPEN_ATTR_PATTERN.search(attrs)
+        elif name == 'summary':
+            hints.add('<summary>')
+
+        if 'kst-ac-item' in classes:
+            items['ac_item'] += 1
+        if 'kst-ac-panel' in classes:
+            closed['ac_item'] += 'kst-show' not in classes
+        if 'kst-faq' in classes:
+            items['faq_active'] += 1
+            closed['faq_active'] += 'kst-active' not in classes
+        if 'kst-faq-question' in classes:
+            items['faq_question'] += 1
+        if 'kst-faq-answer' in classes:
+            closed['faq_question'] += 'kst-active' not in classes and not open_faqs
+        if 'kst-faq-item' in classes:
+            items['faq_item_open'] += 1
+            closed['faq_item_open'] += 'kst-open' not in classes
+        for class_name in classes:
+            if HINT_PATTERN.search(class_name):
+                hints.add('.' + class_name)
+
+        if name not in VOID_ELEMENTS and not attrs.rstrip().endswith('/'):
+            faq_open = 'kst-faq' in classes and 'kst-active' in classes
+            open_elements.append((name, faq_open))
+            open_faqs += faq_open
+
+    # kst-ac-item 은 aria-expanded 로, kst-faq-item 은 kst-open 으로 토글하는 페이지만
+    # 해당 변형으로 봄 (속성/클래스가 CSS 나 JS 에만 있어도 포함)
+    if items['ac_item'] and 'aria-expanded' not in content:
+        items['ac_item'] = 0
+    if items['faq_item_open'] and 'kst-open' not in content:
+        items['faq_item_open'] = 0
+
+    variants = [key for key in VARIANTS if items[key]]
+    return {
+        'variants': variants,
+        'items': {key: items[key] for key in variants},
+        'closed': {key: closed[key] for key in variants},
+        'hints': sorted(hints),
+    }
+
+
+def classify_file(file_path: str) -> dict:
+    """파일 하나 분류 (작업 프로세스에서 실행)"""
+    try:
+        with open(file_path, 'r', encoding='utf-8', errors='replace') as f:
+            content = f.read()
+    except OSError as e:
+        return {'error': str(e)}
+    return classify_content(content)
+
+
+def run_census(root_dir: str, html_files: List[str], jobs: int = None) -> dict:
+    """모든 파일을 병렬로 분류해 변형별 통계 생성"""
+    html_files = sorted(html_files)
+    if jobs == 1:
+        results = [classify_file(path) for path in html_files]
+    else:
+        with ProcessPoolExecutor(max_workers=jobs) as executor:
+            results = list(executor.map(classify_file, html_files, chunksize=8))
+
+    census = {
+        'files': len(html_files),
+        'variants': {
+            key: dict(variant, pages=0, items=0, closed=0, files=[])
+            for key, variant in VARIANTS.items()
+        },
+        'unmatched': [],
+        'no_accordion': [],
+        'errors': [],
+        'pages': {},
+    }
+    for file_path, result in zip(html_files, results):
+        relative = os.path.relpath(file_path, root_dir).replace(os.sep, '/')
+        if 'error' in result:
+            census['errors'].append([relative, result['error']])
+            continue
+        census['pages'][relative] = result
+        for key in result['variants']:
+            variant = census['variants'][key]
+            variant['pages'] += 1
+            variant['items'] += result['items'][key]
+            variant['closed'] += result['closed'][key]
+            variant['files'].append(relative)
+        if not result['variants']:
+            if result['hints']:
+                census['unmatched'].append({'file': relative, 'hints': result['hints']})
+            else:
+                census['no_accordion'].append(relative)
+    return census
+
+
+def write_census_json(census: dict, path: str) -> None:
+    """조사 결과 JSON 저장"""
+    os.makedirs(os.path.dirname(os.path.abspath(path)), exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(census, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def render_markdown(census: dict) -> str:
+    """조사 결과 Markdown 보고서"""
+    numbers = ['1️⃣', '2️⃣', '3️⃣', '4️⃣', '5️⃣', '6️⃣', '7️⃣', '8️⃣', '9️⃣']
+    lines = [
+        '# 아코디언/FAQ 변형 조사 결과',
+        '',
+        '> `python kstation.py census` 로 생성한 보고서입니다. 직접 수정하지 마세요.',
+        '',
+        '## 📋 요약',
+        '',
+        f"- 조사한 페이지: **{census['files']}개**",
+        f"- 알려진 변형에 맞지 않는 페이지: **{len(census['unmatched'])}개**",
+        f"- 아코디언/FAQ 없음: {len(census['no_accordion'])}개",
+        '',
+        '| 변형 | 페이지 | 요소 | 접힌 요소 | 담당 규칙 |',
+        '|------|--------|------|-----------|-----------|',
+    ]
+    for variant in census['variants'].values():
+        rules = ', '.join(f'`{rule}`' for rule in variant['rules'])
+        lines.append(f"| {variant['label']} | {variant['pages']} | {variant['items']} "
+                     f"| {variant['closed']} | {rules} |")
+    lines.append('')
+
+    for number, (key, variant) in zip(numbers, census['variants'].items()):
+        lines += ['---', '', f"## {number} {variant['label']} 패턴", '']
+        if not variant['files']:
+            lines += ['- 사용 파일 없음', '']
+            continue
+        lines.append(f"### 사용 파일 ({variant['pages']}개)")
+        for relative in variant['files']:
+            closed = census['pages'][relative]['closed'][key]
+            suffix = f' (접힌 요소 {closed}개)' if closed else ''
+            lines.append(f'- `{relative}`{suffix}')
+        lines.append('')
+
+    lines += ['---', '', '## ❓ 알려진 변형에 맞지 않는 페이지', '']
+    if census['unmatched']:
+        for entry in census['unmatched']:
+            hints = ', '.join(f'`{hint}`' for hint in entry['hints'])
+            lines.append(f"- `{entry['file']}` - 단서: {hints}")
+    else:
+        lines.append('- 없음')
+    lines.append('')
+
+    if census['errors']:
+        lines += ['## ⚠️ 읽지 못한 파일', '']
+        for relative, error in census['errors']:
+            lines.append(f'- `{relative}`: {error}')
+        lines.append('')
+    return '\n'.join(lines)
+
+
+def print_census_report(census: dict) -> None:
+    """조사 결과 출력"""
+    print("=" * 70)
+    print(f"🧭 아코디언/FAQ 변형 조사 ({census['files']}개 페이지)")
+    print("=" * 70)
+    for variant in census['variants'].values():
+        label = variant['label'].replace('`', '')
+        print(f"  - {label}: {variant['pages']}개 페이지 "
+              f"(요소 {variant['items']}개, 접힌 요소 {variant['closed']}개)")
+    print(f"아코디언/FAQ 없음: {len(census['no_accordion'])}개")
+    print(f"알려진 변형에 맞지 않음: {len(census['unmatched'])}개")
+    for entry in census['unmatched']:
+        print(f"  - {entry['file']}: {', '.join(entry['hints'])}")
+    if census['errors']:
+        print(f"\n⚠️ 오류 발생 파일:")
+        for relative, error in census['errors']:
+            print(f"  - {relative}: {error}")
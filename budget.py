@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+파일별 시간/메모리 예산을 지키는 작업자 프로세스
+
+fix_kst_ac_items 의 DOTALL `.*?` 치환처럼 정규식은 깨졌거나 아주 큰 입력에서 심하게
+역추적할 수 있고, 정규식 매칭 중에는 같은 프로세스 안에서 중단시킬 방법이 없습니다.
+그래서 파일 처리는 작업자 프로세스에서 하고, 부모가 경과 시간과 작업자 RSS 를
+지켜보다가 예산을 넘으면 작업자를 종료하고 새 작업자로 교체합니다.
+
+- 작업자는 규칙을 적용할 때마다 mark_rule() 로 실행 중인 규칙 이름을 공유 메모리에
+  기록하므로, 예산을 넘긴 파일은 (크기, 실행 중이던 규칙)과 함께 격리 목록에 남습니다.
+- 메모리 예산은 Linux 의 /proc/<pid>/statm 으로 확인합니다 (없으면 시간 예산만 적용).
+- kstation.py run 과 기존 스크립트(refactor_accordions.py 의 fix_kst_ac_items,
+  comprehensive_accordion_fix.py 의 detect_accordion_patterns `(?!.*active)` 전방 탐색)
+  모두 --time-limit/--memory-limit 으로 이 작업자를 씁니다. 작업자는 파일을 쓰지 않고
+  편집 목록만 돌려주며, 저널 기록과 저장은 부모가 합니다 (undo_journal.commit_pending).
+"""
+
+import json
+import multiprocessing
+import os
+import time
+from multiprocessing.connection import Connection
+from typing import Callable, Dict, List, Optional
+
+# 루트 폴더 기준 예산 초과 격리 목록 위치
+QUARANTINE_DIR = os.path.join('.kstation', 'quarantine')
+
+DEFAULT_TIME_LIMIT = 30.0
+DEFAULT_MEMORY_LIMIT_MB = 1024
+
+# 부모가 작업자 상태를 확인하는 간격 (초)
+POLL_INTERVAL = 0.05
+
+RULE_SLOT_SIZE = 64
+
+BUDGET_REASONS = {
+    'time': '시간 예산 초과',
+    'memory': '메모리 예산 초과',
+    'crash': '작업자 비정상 종료',
+}
+
+# 작업자 프로세스에서만 설정되는 실행 중 규칙 기록 위치
+_rule_slot = None
+
+
+def mark_rule(key: str) -> None:
+    """실행 중인 규칙 이름 기록 (작업자 프로세스가 아니면 아무것도 하지 않음)"""
+    if _rule_slot is not None:
+        _rule_slot.value = key.encode('utf-8')[:RULE_SLOT_SIZE - 1]
+
+
+def _worker_main(conn: Connection, rule_slot, target: Callable[[tuple], dict]) -> None:
+    """작업자 루프 - 작업을 받아 target 결과를 돌려줌 (None 을 받으면 종료)"""
+    global _rule_slot
+    _rule_slot = rule_slot
+    while True:
+        task = conn.recv()
+        if task is None:
+            break
+        rule_slot.value = b''
+        conn.send(target(task))
+
+
+def resident_memory(pid: int) -> Optional[int]:
+    """프로세스 RSS (bytes, 확인할 수 없으면 None)"""
+    try:
+        with open(f'/proc/{pid}/statm', 'r') as f:
+            resident_pages = int(f.read().split()[1])
+    except (OSError, ValueError, IndexError):
+        return None
+    return resident_pages * os.sysconf('SC_PAGE_SIZE')
+
+
+class BudgetRunner:
+    """작업자 하나로 작업을 차례로 처리하고, 예산을 넘기면 작업자 교체"""
+
+    def __init__(self, target: Callable[[tuple], dict],
+                 time_limit: float = DEFAULT_TIME_LIMIT,
+                 memory_limit_mb: int = DEFAULT_MEMORY_LIMIT_MB):
+        self.target = target
+        self.time_limit = time_limit
+        self.memory_limit = memory_limit_mb * 1024 * 1024 if memory_limit_mb else None
+        self.rule_slot = multiprocessing.Array('c', RULE_SLOT_SIZE, lock=False)
+        self.process = None
+        self.conn = None
+        self.replaced = 0
+
+    def _start(self) -> None:
+        parent_conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_worker_main, args=(child_conn, self.rule_slot, self.target), daemon=True
+        )
+        self.process.start()
+        child_conn.close()
+        self.conn = parent_conn
+
+    def _kill(self) -> None:
+        self.process.kill()
+        self.process.join()
+        self.conn.close()
+        self.process = None
+        self.replaced += 1
+
+    def submit(self, task: tuple) -> dict:
+        """작업 하나 실행
+
+        예산 안에 끝나면 target 결과를, 넘기면
+        {'budget_exceeded': 사유, 'rule': 실행 중 규칙, 'elapsed': 초, 'memory': bytes} 반환
+        """
+        if self.process is None:
+            self._start()
+        self.rule_slot.value = b''
+        self.conn.send(task)
+        started = time.monotonic()
+        peak_memory = 0
+
+        while True:
+            if self.conn.poll(POLL_INTERVAL):
+                try:
+                    return self.conn.recv()
+                except EOFError:
+                    reason = 'crash'
+                    break
+            if not self.process.is_alive():
+                reason = 'crash'
+                break
+            if time.monotonic() - started > self.time_limit:
+                reason = 'time'
+                break
+            if self.memory_limit:
+                memory = resident_memory(self.process.pid) or 0
+                peak_memory = max(peak_memory, memory)
+                if memory > self.memory_limit:
+                    reason = 'memory'
+                    break
+
+        rule = self.rule_slot.value.decode('utf-8', errors='replace')
+        self._kill()
+        return {
+            'budget_exceeded': reason,
+            'rule': rule or None,
+            'elapsed': round(time.monotonic() - started, 3),
+            'memory': peak_memory,
+        }
+
+    def close(self) -> None:
+        """작업자 종료"""
+        if self.process is None:
+            return
+        try:
+            self.conn.send(None)
+        except OSError:
+            pass
+        self.process.join(timeout=1)
+        if self.process.is_alive():
+            self.process.kill()
+            self.process.join()
+        self.conn.close()
+        self.process = None
+
+
+def budget_entry(file_path: str, submitted: dict) -> dict:
+    """예산을 넘긴 submit() 결과를 격리 목록 항목으로 변환 (파일 크기 포함)"""
+    try:
+        size = os.path.getsize(file_path)
+    except OSError:
+        size = 0
+    return {
+        'file': file_path,
+        'reason': submitted['budget_exceeded'],
+        'rule': submitted['rule'],
+        'size': size,
+        'elapsed': submitted['elapsed'],
+        'memory': submitted['memory'],
+    }
+
+
+def describe_budget_failure(entry: dict) -> str:
+    """격리 목록에 남길 한 줄 설명"""
+    rule = entry['rule'] or '(규칙 적용 전)'
+    return (f"{BUDGET_REASONS[entry['reason']]} - 실행 중 규칙: {rule}, "
+            f"크기 {entry['size']:,} bytes, {entry['elapsed']:.1f}s")
+
+
+def write_quarantine(entries: List[Dict], path: str) -> None:
+    """예산 초과 격리 목록(JSON) 저장"""
+    os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+    with open(path, 'w', encoding='utf-8') as f:
+        json.dump(entries, f, ensure_ascii=False, indent=2)
+        f.write('\n')
+
+
+def save_budget_quarantine(entries: List[Dict], root_dir: str, run_id: str) -> str:
+    """실행 ID 이름으로 격리 목록 저장 (파일은 루트 기준 상대 경로) 후 경로 반환"""
+    path = os.path.join(root_dir, QUARANTINE_DIR, f'{run_id}.json')
+    write_quarantine([
+        dict(entry, file=os.path.relpath(entry['file'], root_dir).replace(os.sep, '/'))
+        for entry in entries
+    ], path)
+    return path
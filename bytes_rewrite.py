@@ -0,0 +1,299 @@
+#!/usr/bin/env python3
+"""
+바이트 단위 재작성 경로 (문서 전체를 str 로 디코딩/인코딩하지 않고 수정)
+
+규칙이 넣는 내용(open, aria-expanded="true", kst-show, kst-active, kst-open)은 모두
+ASCII이고, 규칙의 정규식은 태그 하나(<...>) 또는 태그 사이 텍스트 안에서만 일치합니다.
+그래서 페이지 전체를 str 로 바꾸지 않고도 같은 결과를 만들 수 있습니다.
+
+1. 파일을 mmap 으로 열고 규칙 대상 문자열이 나온 태그/텍스트 조각만 찾음
+2. 규칙이 건드릴 수 있는 조각(후보)만 디코딩해 기존 규칙 함수를 그대로 적용
+3. 바뀌지 않은 구간은 memoryview 조각으로 유지하고 os.writev 로 한 번에 기록
+
+안전하게 같은 결과를 보장할 수 없는 파일은 None 을 반환하며, 호출 측은 기존
+str 경로로 처리합니다.
+- 여러 태그에 걸치는 `<span>＋</span>` 치환 규칙이 적용될 수 있는 파일
+  (대소문자, 유니코드 공백까지 넓게 보고 span 안에 + 나 ＋ 가 있으면 모두 넘김)
+- 유효한 UTF-8 이 아닌 파일 (str 경로가 디코딩 오류로 보고)
+- 따옴표가 짝이 맞지 않는 후보 태그 (정규식이 태그 밖까지 일치할 수 있음)
+- 규칙 적용 후 조각이 태그 하나의 모양을 벗어난 경우
+
+UTF-8 검사는 고정 크기 구간씩 디코딩하고 결과는 버리므로 문서 전체 str 을 만들지
+않습니다. 버튼의 aria-expanded 와 패널의 kst-show 일치 검사는 태그 하나로는 할 수
+없으므로, 해당 속성을 건드린 파일만 결과 문서를 디코딩해 같은 검사를 따로 수행하고,
+문제가 나온 경우에만 원본도 디코딩해 원래 있던 문제를 뺍니다.
+"""
+
+import codecs
+import hashlib
+import mmap
+import os
+import re
+import tempfile
+from typing import Callable, Dict, Iterator, List, Optional, Tuple
+
+import refactor_accordions
+from budget import mark_rule
+from html_verifier import introduced_issues, subtract_issues, verify_aria_panels
+
+Rule = Tuple[str, Callable[[str], Tuple[str, int]]]
+
+TAG_PATTERN = re.compile(rb'<[^>]*>')
+
+# 어떤 규칙이든 일치하려면 조각 안에 있어야 하는 문자열
+# (details 태그, aria-expanded, ac-panel/faq 계열 class)
+CANDIDATE_PATTERN = re.compile(rb'<details|aria-expanded|ac-panel|faq', re.IGNORECASE)
+
+# fix_kst_ac_items 의 DOTALL 치환(＋/+ -> −)은 태그 경계를 넘으므로 str 경로로 처리
+# (str 규칙은 IGNORECASE 에 유니코드 \s 를 쓰므로, span 안 텍스트에 + 나 ＋ 가 있으면 넘김)
+CROSS_TAG_PATTERN = re.compile(rb'<span>[^<]*(?:\+|\xef\xbc\x8b)', re.IGNORECASE)
+
+TAG_NAME_PATTERN = re.compile(rb'<\s*(/?)\s*([a-zA-Z][a-zA-Z0-9:-]*)')
+
+ARIA_TRUE_PATTERN = re.compile(r'aria-expanded="true"', re.IGNORECASE)
+
+# 이 문자열이 들어 있는 조각을 바꾸면 문서 전체의 aria-expanded/kst-show 검사가 필요
+CROSS_TAG_CHECK_PATTERN = re.compile(rb'aria-expanded|aria-controls|kst-ac-panel', re.IGNORECASE)
+
+# UTF-8 검사 때 한 번에 디코딩하는 크기
+VALIDATE_CHUNK = 1 << 20
+
+try:
+    IOV_MAX = os.sysconf('SC_IOV_MAX')
+except (AttributeError, ValueError, OSError):
+    IOV_MAX = 1024
+
+
+def candidate_spans(buffer) -> Iterator[Tuple[int, int, bool]]:
+    """규칙이 건드릴 수 있는 조각의 (시작, 끝, 태그 여부)
+
+    후보 문자열이 나온 위치에서만 앞뒤의 '<', '>' 를 찾아 조각 경계를 정하므로
+    페이지의 나머지 태그는 훑지 않습니다.
+    """
+    end = 0
+    length = len(buffer)
+    for hit in CANDIDATE_PATTERN.finditer(buffer):
+        pos = hit.start()
+        if pos < end:
+            continue
+        last_gt = buffer.rfind(b'>', 0, pos)
+        tag_start = buffer.find(b'<', last_gt + 1, pos + 1)
+        if tag_start != -1:
+            tag_end = buffer.find(b'>', pos)
+            if tag_end != -1:
+                end = tag_end + 1
+                yield tag_start, end, True
+                continue
+            # 닫히지 않은 태그는 끝까지 텍스트로 넘김 (_same_shape 에서 걸러짐)
+            end = length
+            yield last_gt + 1, end, False
+            continue
+        end = buffer.find(b'<', pos)
+        if end == -1:
+            end = length
+        yield last_gt + 1, end, False
+
+
+def is_valid_utf8(view: memoryview) -> bool:
+    """버퍼가 유효한 UTF-8 인지 (구간별로 디코딩하고 결과는 보관하지 않음)"""
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    try:
+        for start in range(0, len(view), VALIDATE_CHUNK):
+            decoder.decode(view[start:start + VALIDATE_CHUNK])
+        decoder.decode(b'', True)
+    except UnicodeDecodeError:
+        return False
+    return True
+
+
+def _same_shape(old: bytes, new: bytes, is_tag: bool) -> bool:
+    """수정된 조각이 원래와 같은 종류(같은 이름의 태그 하나 / 태그 없는 텍스트)인지"""
+    if not is_tag:
+        return b'<' not in new and b'>' not in new
+    if not TAG_PATTERN.fullmatch(new):
+        return False
+    old_name = TAG_NAME_PATTERN.match(old)
+    new_name = TAG_NAME_PATTERN.match(new)
+    if not old_name or not new_name:
+        return old_name is None and new_name is None
+    return old_name.groups() == new_name.groups()
+
+
+def rewrite_buffer(buffer, rules: List[Rule]) -> Optional[dict]:
+    """버퍼에 규칙을 적용한 결과 조각 목록 반환 (str 경로가 필요하면 None)
+
+    반환값:
+    - pieces: 출력 순서대로의 memoryview / bytes 조각
+    - edits: (수정 후 오프셋, 이전 바이트, 새 바이트) 목록
+    - stats: 규칙별 수정 건수 (str 경로와 같은 기준)
+    - issues: 수정으로 새로 생긴 구조 문제
+    """
+    if CROSS_TAG_PATTERN.search(buffer):
+        return None
+    view = memoryview(buffer)
+    # 후보 조각만 디코딩하므로, 다른 곳의 잘못된 UTF-8 은 str 경로가 오류로 보고하도록 넘김
+    if not is_valid_utf8(view):
+        view.release()
+        return None
+
+    stats: Dict[str, int] = {key: 0 for key, _ in rules}
+    pieces = []
+    edits = []
+    issues = []
+    last = 0
+    delta = 0
+    # fix_kst_ac_items 는 문서 전체의 aria-expanded="true" 개수와 비교한 값을 돌려주므로
+    # 조각별 합 대신 두 값을 따로 모아 마지막에 계산
+    ac_panels = 0
+    ac_aria_true = 0
+    cross_tag_check = False
+
+    for start, end, is_tag in candidate_spans(buffer):
+        old_bytes = bytes(view[start:end])
+        if is_tag and old_bytes.count(b'"') % 2:
+            view.release()
+            return None
+
+        old_text = old_bytes.decode('utf-8')
+        text = old_text
+        for key, rule in rules:
+            mark_rule(key)
+            before = text
+            text, count = rule(text)
+            if rule is refactor_accordions.fix_kst_ac_items:
+                ac_panels += 'kst-show' not in before and 'kst-show' in text
+                ac_aria_true += len(ARIA_TRUE_PATTERN.findall(text))
+            else:
+                stats[key] += count
+
+        if text == old_text:
+            continue
+
+        new_bytes = text.encode('utf-8')
+        if not _same_shape(old_bytes, new_bytes, is_tag):
+            view.release()
+            return None
+
+        mark_rule('verify')
+        issues.extend(introduced_issues(old_text, text))
+        cross_tag_check = (cross_tag_check or CROSS_TAG_CHECK_PATTERN.search(old_bytes)
+                           or CROSS_TAG_CHECK_PATTERN.search(new_bytes))
+        pieces.append(view[last:start])
+        pieces.append(new_bytes)
+        edits.append((start + delta, old_bytes, new_bytes))
+        delta += len(new_bytes) - len(old_bytes)
+        last = end
+
+    for key, rule in rules:
+        if rule is refactor_accordions.fix_kst_ac_items:
+            stats[key] = max(ac_panels, ac_aria_true)
+
+    if edits:
+        pieces.append(view[last:])
+        if cross_tag_check:
+            mark_rule('verify')
+            aria_issues = verify_aria_panels(b''.join(pieces).decode('utf-8'))
+            if aria_issues:
+                original_text = codecs.decode(view, 'utf-8')
+                issues.extend(subtract_issues(aria_issues, verify_aria_panels(original_text)))
+    return {'pieces': pieces, 'edits': edits, 'stats': stats, 'issues': issues,
+            'view': view}
+
+
+def _release(result: dict) -> None:
+    """mmap 을 닫을 수 있도록 memoryview 참조 해제"""
+    for piece in result['pieces']:
+        if isinstance(piece, memoryview):
+            piece.release()
+    result['view'].release()
+
+
+def writev_all(fd: int, pieces: list) -> None:
+    """조각 목록을 vectored write 로 모두 기록 (부분 기록 처리 포함)"""
+    pending = [piece for piece in pieces if len(piece)]
+    if not hasattr(os, 'writev'):
+        for piece in pending:
+            os.write(fd, piece)
+        return
+    while pending:
+        batch = pending[:IOV_MAX]
+        written = os.writev(fd, batch)
+        consumed = 0
+        while consumed < len(batch) and written >= len(batch[consumed]):
+            written -= len(batch[consumed])
+            consumed += 1
+        pending = pending[consumed:]
+        if written:
+            pending[0] = memoryview(pending[0])[written:]
+
+
+def write_pieces(file_path: str, pieces: list) -> None:
+    """같은 폴더의 임시 파일에 기록 후 교체 (mmap 중인 원본을 직접 덮어쓰지 않음)"""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    mode = os.stat(file_path).st_mode
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.kstation-', suffix='.tmp')
+    try:
+        try:
+            writev_all(fd, pieces)
+        finally:
+            os.close(fd)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def process_file_bytes(file_path: str, rules: List[Rule], journal=None,
+                       write: bool = True) -> Optional[dict]:
+    """바이트 경로로 단일 파일 처리 (str 경로가 필요하면 None)
+
+    write 가 False 이면 저장하지 않고 편집 목록과 전후 해시만 돌려줍니다.
+    """
+    with open(file_path, 'rb') as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return {'modified': False, 'stats': {key: 0 for key, _ in rules}}
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as buffer:
+            result = rewrite_buffer(buffer, rules)
+            if result is None:
+                return None
+            try:
+                if not result['edits']:
+                    return {'modified': False, 'stats': result['stats']}
+
+                # 쓰기 전에 구조 검증 - 수정으로 구조가 깨진 파일은 저장하지 않고 격리
+                if result['issues']:
+                    return {
+                        'modified': False,
+                        'quarantined': True,
+                        'issues': result['issues'],
+                        'stats': result['stats']
+                    }
+
+                post_hash = hashlib.sha256()
+                for piece in result['pieces']:
+                    post_hash.update(piece)
+                post_hash = post_hash.hexdigest()
+                pre_hash = hashlib.sha256(buffer).hexdigest()
+                if not write:
+                    return {
+                        'modified': True,
+                        'pending': True,
+                        'stats': result['stats'],
+                        'edits': result['edits'],
+                        'pre_hash': pre_hash,
+                        'post_hash': post_hash
+                    }
+                mark_rule('write')
+                if journal is not None:
+                    journal.record_edits(file_path, pre_hash, post_hash, result['edits'])
+                write_pieces(file_path, result['pieces'])
+                return {
+                    'modified': True,
+                    'stats': result['stats'],
+                    'edits': result['edits'],
+                    'post_hash': post_hash
+                }
+            finally:
+                _release(result)
@@ -0,0 +1,136 @@
+#!/usr/bin/env python3
+"""
+긴 kst-section 페이지에 content-visibility 주입
+
+제품 페이지는 .kst-section / .kst-card 블록이 수십 개 쌓여 있어 브라우저가 화면 밖
+섹션까지 처음부터 레이아웃/페인트합니다. 첫 화면 분량 이후의 섹션에
+`content-visibility: auto` 와 내용으로 추정한 `contain-intrinsic-size` 를 인라인
+스타일로 추가합니다.
+
+- 첫 화면(FIRST_SCREEN_PX) 안에 들어가는 앞쪽 섹션은 그대로 둠
+- 아코디언 규칙이 펼쳐 둔 내용(details open, kst-show, kst-active, kst-open,
+  aria-expanded="true")이 들어 있는 섹션은 건드리지 않음
+- 이미 content-visibility 가 있는 섹션은 건너뜀 (여러 번 실행해도 같은 결과)
+"""
+
+import re
+from typing import Tuple
+
+# 모바일 첫 화면으로 보는 높이 (px)
+FIRST_SCREEN_PX = 1000
+
+# 섹션 높이 추정값 (px)
+SECTION_BASE_PX = 96
+HEADING_PX = 40
+IMAGE_PX = 240
+CARD_PX = 140
+TABLE_ROW_PX = 44
+LINE_PX = 24
+CHARS_PER_LINE = 40
+
+SECTION_START_PATTERN = re.compile(
+    r'<(div|section)\b[^>]*\bclass\s*=\s*["\']([^"\']*)["\'][^>]*>',
+    re.IGNORECASE
+)
+
+FORCED_OPEN_PATTERN = re.compile(
+    r'<details\b[^>]*\bopen\b'
+    r'|\bkst-(?:show|active|open)\b'
+    r'|aria-expanded\s*=\s*["\']true["\']',
+    re.IGNORECASE
+)
+
+HEADING_PATTERN = re.compile(r'<h[1-4]\b', re.IGNORECASE)
+IMAGE_PATTERN = re.compile(r'<(?:img|picture|svg|video)\b', re.IGNORECASE)
+CARD_PATTERN = re.compile(r'class\s*=\s*["\'][^"\']*\bkst-card\b', re.IGNORECASE)
+TABLE_ROW_PATTERN = re.compile(r'<tr\b', re.IGNORECASE)
+TAG_PATTERN = re.compile(r'<[^>]*>')
+STYLE_ATTR_PATTERN = re.compile(r'\bstyle\s*=\s*(["\'])(.*?)\1', re.IGNORECASE | re.DOTALL)
+
+
+def find_block_end(content: str, tag_name: str, start: int) -> int:
+    """start 위치의 여는 태그에 대응하는 닫는 태그의 끝 위치 (없으면 -1)"""
+    pattern = re.compile(r'<(/?)' + tag_name + r'\b[^>]*>', re.IGNORECASE)
+    depth = 0
+    for match in pattern.finditer(content, start):
+        if match.group(1):
+            depth -= 1
+            if depth == 0:
+                return match.end()
+        elif not match.group(0).endswith('/>'):
+            depth += 1
+    return -1
+
+
+def estimate_section_height(block: str) -> int:
+    """섹션 내용으로 렌더링 높이 추정 (px, 10 단위)"""
+    height = SECTION_BASE_PX
+    height += HEADING_PX * len(HEADING_PATTERN.findall(block))
+    height += IMAGE_PX * len(IMAGE_PATTERN.findall(block))
+    height += CARD_PX * len(CARD_PATTERN.findall(block))
+    height += TABLE_ROW_PX * len(TABLE_ROW_PATTERN.findall(block))
+    text = ' '.join(TAG_PATTERN.sub(' ', block).split())
+    height += LINE_PX * (len(text) // CHARS_PER_LINE)
+    return int(round(height, -1))
+
+
+def add_content_visibility(tag: str, height: int) -> str:
+    """여는 태그의 인라인 스타일에 content-visibility 추가"""
+    declarations = (
+        f'content-visibility: auto; contain-intrinsic-size: auto {height}px'
+    )
+    style_match = STYLE_ATTR_PATTERN.search(tag)
+    if style_match:
+        quote, style = style_match.group(1), style_match.group(2).rstrip()
+        if style and not style.endswith(';'):
+            style += ';'
+        new_style = f'{style} {declarations}'.strip()
+        return (tag[:style_match.start()] + f'style={quote}{new_style}{quote}'
+                + tag[style_match.end():])
+    closing = '/>' if tag.endswith('/>') else '>'
+    return tag[:-len(closing)].rstrip() + f' style="{declarations}"' + closing
+
+
+def inject_content_visibility(content: str) -> Tuple[str, int]:
+    """첫 화면 이후의 .kst-section 에 content-visibility 주입"""
+    count = 0
+    parts = []
+    last = 0
+    pos = 0
+    offset_px = 0
+
+    while True:
+        match = SECTION_START_PATTERN.search(content, pos)
+        if not match:
+            break
+        if 'kst-section' not in match.group(2).split():
+            pos = match.end()
+            continue
+
+        block_end = find_block_end(content, match.group(1), match.start())
+        if block_end == -1:
+            break
+        # 안쪽에 중첩된 kst-section 은 바깥 섹션과 함께 처리된 것으로 봄
+        pos = block_end
+
+        block = content[match.start():block_end]
+        height = estimate_section_height(block)
+        above_fold = offset_px < FIRST_SCREEN_PX
+        offset_px += height
+
+        tag = match.group(0)
+        if above_fold or FORCED_OPEN_PATTERN.search(block):
+            continue
+        style_match = STYLE_ATTR_PATTERN.search(tag)
+        if style_match and 'content-visibility' in style_match.group(2).lower():
+            continue
+
+        parts.append(content[last:match.start()])
+        parts.append(add_content_visibility(tag, height))
+        last = match.end()
+        count += 1
+
+    if not count:
+        return content, 0
+    parts.append(content[last:])
+    return ''.join(parts), count
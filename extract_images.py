@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+인라인 data:image URI 를 콘텐츠 해시 이름의 외부 파일로 추출
+
+base64 (`data:image/png;base64,...`) 와 퍼센트 인코딩 (`data:image/svg+xml,%3Csvg...`)
+URI 를 모두 디코딩해 `<해시>.<확장자>` 로 에셋 폴더에 쓰고, 참조를 파일 URL 로
+바꿉니다. 이름이 내용 해시이므로 코퍼스 전체에서 같은 이미지는 파일 하나를 공유하고,
+publish 단계는 이 이름을 그대로 씁니다.
+
+inline_below 보다 작은 이미지는 요청 하나를 늘리는 것보다 인라인이 나으므로
+그대로 둘 수 있습니다 (기본 0: 모두 추출).
+
+규칙 체인 안에서는 참조만 바꾸고 에셋은 대기 목록에 둡니다. 페이지가 실제로 저장된
+뒤 commit() 으로 기록하고 집계하며, 격리되거나 오류가 난 페이지는 discard() 로 버립니다.
+"""
+
+import base64
+import binascii
+import os
+import re
+from typing import Dict, Optional, Tuple
+from urllib.parse import unquote_to_bytes
+
+from publish import content_hash
+
+# 루트 폴더 기준 기본 에셋 위치 (미리보기 서버에서 /assets/ 로 보임)
+ASSETS_DIR = 'assets'
+
+DATA_URI_START = re.compile(r'data:image/([a-z0-9.+-]+)((?:;[a-z0-9.+=-]+)*),', re.IGNORECASE)
+
+# 따옴표 없는 CSS url( 바로 뒤에서 시작하는 URI 인지 확인
+URL_FUNCTION_END = re.compile(r'url\(\s*$', re.IGNORECASE)
+
+EXTENSIONS = {
+    'png': '.png',
+    'jpeg': '.jpg',
+    'jpg': '.jpg',
+    'gif': '.gif',
+    'webp': '.webp',
+    'avif': '.avif',
+    'svg+xml': '.svg',
+    'x-icon': '.ico',
+    'vnd.microsoft.icon': '.ico',
+}
+
+
+def find_uri_end(content: str, start: int, data_start: int) -> int:
+    """data URI 의 끝 위치 - 감싸는 따옴표 또는 url( ) 기준"""
+    before = content[start - 1] if start > 0 else ''
+    if before in ('"', "'"):
+        end = content.find(before, data_start)
+        return end if end != -1 else len(content)
+    # 따옴표 없는 url(data:image/svg+xml;utf8,<svg ...>) 는 '<' 가 아니라 ')' 에서 끝남
+    if URL_FUNCTION_END.search(content, max(0, start - 16), start):
+        end = content.find(')', data_start)
+        return end if end != -1 else len(content)
+    match = re.compile(r'[\s)"\'<>]').search(content, data_start)
+    return match.start() if match else len(content)
+
+
+def decode_data(payload: str, params: str) -> Optional[bytes]:
+    """URI 데이터 부분 디코딩 (실패하면 None)"""
+    if ';base64' in params.lower():
+        try:
+            return base64.b64decode(''.join(payload.split()), validate=True)
+        except (binascii.Error, ValueError):
+            return None
+    return unquote_to_bytes(payload)
+
+
+class ImageExtractor:
+    """규칙 체인에 붙는 이미지 추출 단계 (rule(content) -> (content, 추출 수))"""
+
+    def __init__(self, assets_dir: str, base_url: str = '/' + ASSETS_DIR,
+                 inline_below: int = 0):
+        self.assets_dir = assets_dir
+        self.base_url = base_url.rstrip('/')
+        self.inline_below = inline_below
+        self.bytes_saved = 0
+        self.images_extracted = 0
+        self.files_written = 0
+        self.hashes = set()
+        # 현재 문서에서 추출했지만 아직 기록하지 않은 에셋과 집계
+        self.pending: Dict[str, bytes] = {}
+        self.pending_images = 0
+        self.pending_bytes_saved = 0
+
+    def write_asset(self, file_name: str, data: bytes) -> None:
+        """해시 이름으로 에셋 기록 (이미 있으면 그대로 재사용)"""
+        path = os.path.join(self.assets_dir, file_name)
+        if not os.path.exists(path):
+            os.makedirs(self.assets_dir, exist_ok=True)
+            temp_path = path + '.tmp'
+            with open(temp_path, 'wb') as f:
+                f.write(data)
+            os.replace(temp_path, path)
+            self.files_written += 1
+        self.hashes.add(file_name)
+
+    def commit(self) -> None:
+        """페이지가 저장된 뒤 대기 중인 에셋을 기록하고 집계에 반영"""
+        for file_name, data in self.pending.items():
+            self.write_asset(file_name, data)
+        self.images_extracted += self.pending_images
+        self.bytes_saved += self.pending_bytes_saved
+        self.discard()
+
+    def discard(self) -> None:
+        """저장되지 않은 페이지(격리, 오류)의 대기 에셋 폐기"""
+        self.pending = {}
+        self.pending_images = 0
+        self.pending_bytes_saved = 0
+
+    def __call__(self, content: str) -> Tuple[str, int]:
+        count = 0
+        parts = []
+        last = 0
+        pos = 0
+        while True:
+            match = DATA_URI_START.search(content, pos)
+            if not match:
+                break
+            start = match.start()
+            end = find_uri_end(content, start, match.end())
+            pos = end
+
+            extension = EXTENSIONS.get(match.group(1).lower())
+            if extension is None:
+                continue
+            data = decode_data(content[match.end():end], match.group(2))
+            # 비어 있거나 디코딩할 수 없는 URI 는 그대로 둠
+            if not data or len(data) < self.inline_below:
+                continue
+
+            file_name = content_hash(data) + extension
+            self.pending[file_name] = data
+            reference = f'{self.base_url}/{file_name}'
+            parts.append(content[last:start])
+            parts.append(reference)
+            last = end
+            count += 1
+            self.pending_bytes_saved += (end - start) - len(reference)
+
+        if not count:
+            return content, 0
+        self.pending_images += count
+        parts.append(content[last:])
+        return ''.join(parts), count
+
+    def print_report(self) -> None:
+        """추출 결과 출력"""
+        print(f"\n🖼️ 인라인 이미지 추출")
+        print(f"  - 추출한 참조: {self.images_extracted}개")
+        print(f"  - 고유 이미지: {len(self.hashes)}개 (새로 기록 {self.files_written}개)")
+        print(f"  - HTML 절감: {self.bytes_saved:,} bytes")
+        print(f"  - 에셋 폴더: {self.assets_dir}")
@@ -3,16 +3,20 @@
 complete-shopify 폴더의 모든 HTML 파일에 FAQ/아코디언 기본 펼침 상태 적용 스크립트
 """
 
+import argparse
 import os
 import re
 from pathlib import Path
 from typing import List, Tuple, Dict
 
+from html_verifier import introduced_issues
+from undo_journal import JOURNAL_DIR, UndoJournal, print_undo_report, undo_run
+
 def find_html_files(root_dir: str) -> List[str]:
     """모든 HTML 파일 찾기"""
     html_files = []
     for root, dirs, files in os.walk(root_dir):
-        if '.git' in root:
+        if '.git' in root or '.kstation' in root:
             continue
         for file in files:
             if file.endswith('.html') and not file.startswith('.'):
@@ -160,11 +164,12 @@ def fix_faq_item_open(content: str) -> Tuple[str, int]:
     
     return content, count
 
-def process_file(file_path: str) -> dict:
-    """단일 파일 처리"""
+def process_file(file_path: str, journal: UndoJournal = None) -> dict:
+    """단일 파일 처리 (journal이 있으면 수정 내역을 기록)"""
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            original_bytes = f.read()
+        content = original_bytes.decode('utf-8')
         
         original_content = content
         
@@ -183,10 +188,24 @@ def process_file(file_path: str) -> dict:
         content, stats['faq_answer'] = fix_faq_answer_active(content)
         content, stats['faq_item_open'] = fix_faq_item_open(content)
         
+        # 쓰기 전에 구조 검증 - 수정으로 구조가 깨진 파일은 저장하지 않고 격리
+        if content != original_content:
+            issues = introduced_issues(original_content, content)
+            if issues:
+                return {
+                    'modified': False,
+                    'quarantined': True,
+                    'issues': issues,
+                    'stats': stats
+                }
+        
         # 변경사항이 있으면 저장
         if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            new_bytes = content.encode('utf-8')
+            if journal is not None:
+                journal.record(file_path, original_bytes, new_bytes)
+            with open(file_path, 'wb') as f:
+                f.write(new_bytes)
             return {
                 'modified': True,
                 'stats': stats
@@ -202,6 +221,21 @@ def process_file(file_path: str) -> dict:
 
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--undo', metavar='RUN_ID',
+                        help='저널을 이용해 지정한 실행의 수정 내역을 되돌립니다')
+    args = parser.parse_args()
+    journal_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), JOURNAL_DIR)
+    
+    if args.undo:
+        try:
+            result = undo_run(journal_dir, args.undo)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            return
+        print_undo_report(args.undo, result)
+        return
+    
     root_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'complete-shopify')
     
     if not os.path.exists(root_dir):
@@ -224,13 +258,19 @@ def main():
     }
     modified_files = []
     error_files = []
+    quarantined_files = []
+    
+    journal = UndoJournal(journal_dir)
     
     for file_path in html_files:
-        result = process_file(file_path)
+        result = process_file(file_path, journal)
         
         if 'error' in result:
             error_files.append((file_path, result['error']))
             print(f"❌ 오류: {os.path.basename(file_path)} - {result['error']}")
+        elif result.get('quarantined'):
+            quarantined_files.append((file_path, result['issues']))
+            print(f"🚧 격리: {os.path.basename(file_path)} - 구조 검증 실패 {len(result['issues'])}건")
         elif result['modified']:
             modified_files.append(file_path)
             stats = result['stats']
@@ -258,6 +298,9 @@ def main():
     print(f"총 파일 수: {len(html_files)}")
     print(f"수정된 파일: {len(modified_files)}")
     print(f"오류 발생: {len(error_files)}")
+    print(f"격리된 파일: {len(quarantined_files)}")
+    if journal.entries:
+        print(f"되돌리기: python {os.path.basename(__file__)} --undo {journal.run_id}")
     print(f"\n총 변경 사항:")
     print(f"  - <details> 태그: {total_stats['details']}개")
     print(f"  - aria-expanded: {total_stats['aria_expanded']}개")
@@ -269,6 +312,13 @@ def main():
         print(f"\n⚠️ 오류 발생 파일:")
         for file_path, error in error_files:
             print(f"  - {os.path.basename(file_path)}: {error}")
+    
+    if quarantined_files:
+        print(f"\n🚧 격리된 파일 (저장하지 않음):")
+        for file_path, issues in quarantined_files:
+            print(f"  - {os.path.basename(file_path)}:")
+            for issue in issues:
+                print(f"      {issue}")
 
 if __name__ == '__main__':
     main()
@@ -0,0 +1,320 @@
+#!/usr/bin/env python3
+"""
+정규식 수정 결과 HTML의 구조 검증기
+
+process_file이 파일을 쓰기 전에 메모리상의 결과를 한 번의 선형 패스로 검사합니다.
+- 태그 균형 (열림/닫힘 짝)
+- 속성 정상 여부: 중복 class 토큰, 중복 속성(open 등)
+- aria-expanded 와 대상 패널의 kst-show 클래스 일치 여부
+  (aria-controls 로 가리키는 패널, aria-controls 없는 항목은 안에 든 패널)
+"""
+
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+# 닫는 태그가 없는 요소
+VOID_ELEMENTS = {
+    'area', 'base', 'br', 'col', 'embed', 'hr', 'img', 'input',
+    'link', 'meta', 'param', 'source', 'track', 'wbr'
+}
+
+# 내용을 태그로 해석하지 않는 요소 (닫는 태그까지 건너뜀)
+RAW_TEXT_ELEMENTS = {'script', 'style', 'textarea', 'title'}
+
+# HTML 규격상 닫는 태그를 생략할 수 있는 요소
+OPTIONAL_END_TAGS = {
+    'html', 'head', 'body', 'p', 'li', 'dt', 'dd', 'tr', 'td', 'th',
+    'thead', 'tbody', 'tfoot', 'colgroup', 'option', 'optgroup', 'rt', 'rp'
+}
+
+TOKEN_PATTERN = re.compile(
+    r'<!--.*?-->'
+    r'|<![^>]*>'
+    r'|<\?[^>]*>'
+    r'|<(/?)([a-zA-Z][a-zA-Z0-9:-]*)((?:[^>"\']|"[^"]*"|\'[^\']*\')*)>',
+    re.DOTALL
+)
+
+ATTR_PATTERN = re.compile(
+    r'([^\s"\'=/>]+)(?:\s*=\s*(?:"([^"]*)"|\'([^\']*)\'|([^\s>]+)))?'
+)
+
+
+def parse_attributes(attr_text: str) -> List[Tuple[str, str]]:
+    """태그 속성 문자열을 (이름, 값) 목록으로 분해 (중복 유지)"""
+    attrs = []
+    for match in ATTR_PATTERN.finditer(attr_text):
+        name = match.group(1).lower()
+        value = next((g for g in match.groups()[1:] if g is not None), '')
+        attrs.append((name, value))
+    return attrs
+
+
+class LineIndex:
+    """오프셋 -> 줄 번호 (오류 메시지용)
+
+    줄바꿈 위치는 첫 조회 때 한 번만 모아 두고 이진 탐색하므로, 문제가 많은 파일에서도
+    문제마다 파일 처음부터 줄바꿈을 다시 세지 않습니다.
+    """
+
+    def __init__(self, content: str):
+        self.content = content
+        self.newlines = None
+
+    def __call__(self, offset: int) -> int:
+        if self.newlines is None:
+            self.newlines = [match.start() for match in re.finditer('\n', self.content)]
+        return bisect_left(self.newlines, offset) + 1
+
+
+def expanded_container(attr_map: Dict[str, str]) -> Optional[str]:
+    """aria-controls 없이 aria-expanded 를 가진 항목이면 그 값 (안에 든 패널을 펼침 대상으로 봄)
+
+    예: <div class="kst-ac-item" aria-expanded="true"> ... <div class="kst-ac-panel">
+    """
+    if 'aria-expanded' in attr_map and 'aria-controls' not in attr_map:
+        return attr_map['aria-expanded'].lower()
+    return None
+
+
+def nearest_container(stack: List[Tuple[str, int]],
+                      containers: Dict[int, str]) -> Optional[str]:
+    """열린 요소 스택에서 가장 가까운 aria-expanded 항목의 값 (containers: 위치 -> 값)"""
+    for _, open_pos in reversed(stack):
+        if open_pos in containers:
+            return containers[open_pos]
+    return None
+
+
+def collect_aria_state(attr_map: Dict[str, str], classes: List[str], offset: int,
+                       expanded_targets: Dict[str, Tuple[str, int]],
+                       panel_shown: Dict[str, bool],
+                       contained_panels: List[Tuple[str, bool, int]],
+                       container: Optional[str] = None) -> None:
+    """태그 하나의 aria-controls/aria-expanded 와 kst-ac-panel 상태 수집
+
+    container 는 이 태그를 감싸는 가장 가까운 aria-expanded 항목의 값입니다.
+    """
+    if 'aria-expanded' in attr_map and 'aria-controls' in attr_map:
+        for target in attr_map['aria-controls'].split():
+            expanded_targets[target] = (attr_map['aria-expanded'].lower(), offset)
+    if 'kst-ac-panel' in classes:
+        if attr_map.get('id'):
+            panel_shown[attr_map['id']] = 'kst-show' in classes
+        if container is not None:
+            contained_panels.append((container, 'kst-show' in classes, offset))
+
+
+def aria_mismatches(expanded_targets: Dict[str, Tuple[str, int]],
+                    panel_shown: Dict[str, bool],
+                    contained_panels: List[Tuple[str, bool, int]], line_number) -> List[str]:
+    """aria-expanded 값과 대상 패널의 kst-show 가 맞지 않는 곳"""
+    issues = []
+    for target, (expanded, offset) in expanded_targets.items():
+        if target not in panel_shown:
+            continue
+        if (expanded == 'true') != panel_shown[target]:
+            issues.append(
+                f"aria-expanded=\"{expanded}\" 와 #{target} 의 kst-show 불일치 "
+                f"(줄 {line_number(offset)})"
+            )
+    for expanded, shown, offset in contained_panels:
+        if (expanded == 'true') != shown:
+            issues.append(
+                f"aria-expanded=\"{expanded}\" 항목 안 kst-ac-panel 의 kst-show 불일치 "
+                f"(줄 {line_number(offset)})"
+            )
+    return issues
+
+
+def verify_html(content: str) -> List[str]:
+    """HTML 구조 검증 - 발견된 문제 목록 반환 (비어 있으면 정상)"""
+    issues = []
+    line_number = LineIndex(content)
+    stack: List[Tuple[str, int]] = []
+    # 스택에 열려 있는 태그 이름별 개수 (짝이 없는 닫는 태그를 스택을 훑지 않고 판별)
+    open_counts: Counter = Counter()
+    # aria-controls 대상 id -> (aria-expanded 값, 위치)
+    expanded_targets: Dict[str, Tuple[str, int]] = {}
+    # id -> kst-show 여부 (kst-ac-panel 인 요소만)
+    panel_shown: Dict[str, bool] = {}
+    # aria-controls 없는 aria-expanded 항목: 스택 위치 -> aria-expanded 값
+    containers: Dict[int, str] = {}
+    # (감싸는 항목의 aria-expanded 값, kst-show 여부, 위치)
+    contained_panels: List[Tuple[str, bool, int]] = []
+
+    pos = 0
+    length = len(content)
+    while pos < length:
+        match = TOKEN_PATTERN.search(content, pos)
+        if not match:
+            break
+        pos = match.end()
+
+        tag_name = match.group(2)
+        if tag_name is None:
+            # 주석, DOCTYPE 등
+            continue
+        tag_name = tag_name.lower()
+        is_closing = match.group(1) == '/'
+
+        if is_closing:
+            if tag_name in VOID_ELEMENTS:
+                continue
+            # 스택에서 짝을 찾고, 그 사이의 생략 가능한 요소만 암묵적으로 닫음
+            if open_counts[tag_name]:
+                index = len(stack) - 1
+                while stack[index][0] != tag_name:
+                    index -= 1
+                for open_name, open_pos in stack[index + 1:]:
+                    if open_name not in OPTIONAL_END_TAGS:
+                        issues.append(
+                            f"닫히지 않은 <{open_name}> "
+                            f"(줄 {line_number(open_pos)})"
+                        )
+                for open_name, _ in stack[index:]:
+                    open_counts[open_name] -= 1
+                del stack[index:]
+            else:
+                issues.append(
+                    f"짝이 없는 </{tag_name}> (줄 {line_number(match.start())})"
+                )
+            continue
+
+        attr_text = match.group(3)
+        attrs = parse_attributes(attr_text)
+        names = [name for name, _ in attrs]
+        for name in set(names):
+            if names.count(name) > 1:
+                issues.append(
+                    f"<{tag_name}> 중복 속성 '{name}' "
+                    f"(줄 {line_number(match.start())})"
+                )
+
+        attr_map = dict(attrs)
+        classes = attr_map.get('class', '').split()
+        for token in set(classes):
+            if classes.count(token) > 1:
+                issues.append(
+                    f"<{tag_name}> 중복 class '{token}' "
+                    f"(줄 {line_number(match.start())})"
+                )
+
+        container = nearest_container(stack, containers) if 'kst-ac-panel' in classes else None
+        collect_aria_state(attr_map, classes, match.start(), expanded_targets, panel_shown,
+                           contained_panels, container)
+
+        self_closing = attr_text.rstrip().endswith('/')
+        if tag_name in VOID_ELEMENTS or self_closing:
+            continue
+
+        if tag_name in RAW_TEXT_ELEMENTS:
+            # 원시 텍스트 요소는 닫는 태그까지 바로 이동
+            close_match = re.compile(
+                r'</' + tag_name + r'\s*>', re.IGNORECASE
+            ).search(content, pos)
+            if not close_match:
+                issues.append(
+                    f"닫히지 않은 <{tag_name}> (줄 {line_number(match.start())})"
+                )
+                break
+            pos = close_match.end()
+            continue
+
+        stack.append((tag_name, match.start()))
+        open_counts[tag_name] += 1
+        expanded = expanded_container(attr_map)
+        if expanded is not None:
+            containers[match.start()] = expanded
+
+    for open_name, open_pos in stack:
+        if open_name not in OPTIONAL_END_TAGS:
+            issues.append(
+                f"닫히지 않은 <{open_name}> (줄 {line_number(open_pos)})"
+            )
+
+    issues.extend(aria_mismatches(expanded_targets, panel_shown, contained_panels, line_number))
+    return issues
+
+
+def verify_aria_panels(content: str) -> List[str]:
+    """verify_html 중 aria-expanded/kst-show 일치 검사만 수행
+
+    태그 하나씩 검사하는 바이트 경로는 버튼과 패널이 서로 다른 태그라 이 검사를 할 수
+    없으므로, 문서 전체에 대해 verify_html 과 같은 토큰 규칙(주석, 원시 텍스트 요소
+    건너뜀)으로 따로 수행합니다.
+    """
+    expanded_targets: Dict[str, Tuple[str, int]] = {}
+    panel_shown: Dict[str, bool] = {}
+    containers: Dict[int, str] = {}
+    contained_panels: List[Tuple[str, bool, int]] = []
+    # 패널을 감싸는 항목을 찾기 위한 열린 요소 스택 (짝이 없는 닫는 태그는 무시)
+    stack: List[Tuple[str, int]] = []
+    pos = 0
+    while True:
+        match = TOKEN_PATTERN.search(content, pos)
+        if not match:
+            break
+        pos = match.end()
+        tag_name = match.group(2)
+        if tag_name is None:
+            continue
+        tag_name = tag_name.lower()
+        if match.group(1) == '/':
+            for index in range(len(stack) - 1, -1, -1):
+                if stack[index][0] == tag_name:
+                    del stack[index:]
+                    break
+            continue
+        attr_text = match.group(3)
+        attr_map = dict(parse_attributes(attr_text))
+        classes = attr_map.get('class', '').split()
+        container = nearest_container(stack, containers) if 'kst-ac-panel' in classes else None
+        collect_aria_state(attr_map, classes, match.start(), expanded_targets, panel_shown,
+                           contained_panels, container)
+        if tag_name in VOID_ELEMENTS or attr_text.rstrip().endswith('/'):
+            continue
+        if tag_name in RAW_TEXT_ELEMENTS:
+            close_match = re.compile(
+                r'</' + tag_name + r'\s*>', re.IGNORECASE
+            ).search(content, pos)
+            if not close_match:
+                break
+            pos = close_match.end()
+            continue
+        stack.append((tag_name, match.start()))
+        expanded = expanded_container(attr_map)
+        if expanded is not None:
+            containers[match.start()] = expanded
+    return aria_mismatches(expanded_targets, panel_shown, contained_panels, LineIndex(content))
+
+
+def subtract_issues(issues: List[str], original_issues: List[str]) -> List[str]:
+    """원본에도 있던 문제(줄 번호 무시)를 뺀 나머지"""
+
+    def strip_line(issue: str) -> str:
+        return re.sub(r'\s*\(줄 \d+\)$', '', issue)
+
+    remaining = Counter(strip_line(issue) for issue in original_issues)
+    new = []
+    for issue in issues:
+        key = strip_line(issue)
+        if remaining[key] > 0:
+            remaining[key] -= 1
+        else:
+            new.append(issue)
+    return new
+
+
+def introduced_issues(original: str, content: str) -> List[str]:
+    """수정 결과에서 새로 생긴 문제만 반환
+
+    결과가 통과하면 원본은 검사하지 않습니다. 원래부터 깨져 있던 페이지는
+    같은 문제가 남아 있어도 수정 때문에 생긴 것이 아니므로 제외합니다.
+    """
+    issues = verify_html(content)
+    if not issues:
+        return []
+    return subtract_issues(issues, verify_html(original))
@@ -0,0 +1,679 @@
+#!/usr/bin/env python3
+"""
+kstation - 아코디언/FAQ 기본 펼침 규칙을 한 번에 적용하는 통합 CLI
+
+refactor_accordions.py, comprehensive_accordion_fix.py,
+fix_complete_shopify_accordions.py 를 차례로 실행하면 complete-shopify/ 파일은
+최대 세 번 읽히고 다시 쓰입니다. 이 명령은 파일마다 규칙 프로파일의 합집합을
+적용해 한 번 읽고 한 번만 씁니다.
+
+프로파일:
+- root: 루트 폴더 페이지 (refactor_accordions + comprehensive_accordion_fix 규칙 +
+  fix_faq_answer_active)
+- complete-shopify: complete-shopify/ 페이지 (root 규칙 + fix_complete_shopify_accordions 규칙)
+
+사용법:
+    python kstation.py run [--profile all|root|complete-shopify] [--root DIR]
+    python kstation.py run --content-visibility
+    python kstation.py run --extract-images [--inline-below BYTES]
+    python kstation.py run --shard 2/4 [--stats-out PATH]
+    python kstation.py run --cache [--cache-dir DIR]
+    python kstation.py run --time-limit 30 [--memory-limit 1024]
+    python kstation.py dupes [--threshold 0.8] [--json PATH]
+    python kstation.py census [--jobs N] [--json PATH] [--markdown PATH]
+    python kstation.py merge SHARD_STATS.json ...
+    python kstation.py publish [--out DIR] [--assets DIR]
+    python kstation.py serve [--port 8000] [--cache-size 256]
+    python kstation.py undo RUN_ID [--root DIR]
+"""
+
+import argparse
+import hashlib
+import inspect
+import json
+import os
+from typing import Callable, Dict, List, Tuple
+
+import comprehensive_accordion_fix
+import fix_complete_shopify_accordions
+import refactor_accordions
+from accordion_census import (CENSUS_DIR, CENSUS_JSON, CENSUS_MARKDOWN, print_census_report,
+                              render_markdown, run_census, write_census_json)
+from budget import (DEFAULT_MEMORY_LIMIT_MB, BudgetRunner, budget_entry,
+                    describe_budget_failure, mark_rule, save_budget_quarantine)
+from bytes_rewrite import process_file_bytes, write_pieces
+from content_visibility import inject_content_visibility
+from extract_images import ASSETS_DIR, ImageExtractor
+from html_verifier import introduced_issues
+from near_duplicates import DEFAULT_THRESHOLD, find_near_duplicates, print_near_duplicate_report
+from preview_server import serve
+from publish import PUBLISH_DIR, print_publish_report, publish
+from sharding import (STATS_DIR, load_artifact, merge_artifacts, parse_shard, shard_files,
+                      summary_to_artifact, write_artifact)
+from transform_cache import CACHE_DIR, TransformCache, apply_edits, content_key
+from undo_journal import (JOURNAL_DIR, UndoJournal, commit_pending, diff_edits, file_hash,
+                          print_undo_report, undo_run)
+
+Rule = Tuple[str, Callable[[str], Tuple[str, int]]]
+
+# 세 스크립트를 순서대로 실행했을 때와 같은 순서로 규칙 적용
+# (내용이 같은 중복 규칙은 한 번만 포함)
+# faq_question/faq_active 는 정리 단계에서 .kst-faq-answer 의 kst-active 를 지우므로,
+# `.kst-faq-answer.kst-active` 로 답변을 보이는 루트 페이지(a11, a17, a33 등)가 접히지
+# 않도록 root 프로파일에도 faq_answer 를 마지막에 적용
+ROOT_RULES: List[Rule] = [
+    ('details', refactor_accordions.fix_details_tags),
+    ('ac_items', refactor_accordions.fix_kst_ac_items),
+    ('faq_items', refactor_accordions.fix_kst_faq_items),
+    ('faq_question', refactor_accordions.fix_kst_faq_question_pattern),
+    ('aria_expanded', comprehensive_accordion_fix.fix_aria_expanded),
+    ('ac_panel', comprehensive_accordion_fix.fix_ac_panel_show),
+    ('faq_active', comprehensive_accordion_fix.fix_faq_active),
+    ('faq_answer', fix_complete_shopify_accordions.fix_faq_answer_active),
+]
+
+COMPLETE_SHOPIFY_RULES: List[Rule] = ROOT_RULES + [
+    ('faq_item_open', fix_complete_shopify_accordions.fix_faq_item_open),
+]
+
+RULE_PROFILES: Dict[str, List[Rule]] = {
+    'root': ROOT_RULES,
+    'complete-shopify': COMPLETE_SHOPIFY_RULES,
+}
+
+# 조각 단위로 적용해도 결과가 같은 규칙 (바이트 경로 사용 가능)
+FRAGMENT_RULES = {rule for rules in RULE_PROFILES.values() for _, rule in rules}
+
+# 아코디언 규칙 뒤에 선택적으로 붙는 문서 단위 단계
+STAGES: Dict[str, Rule] = {
+    'content_visibility': ('content_visibility', inject_content_visibility),
+}
+
+# 프로파일별 대상 하위 폴더 (root 프로파일은 나머지 전체)
+PROFILE_DIRS = {
+    'complete-shopify': 'complete-shopify',
+}
+
+STAT_LABELS = {
+    'details': '<details> 태그',
+    'ac_items': '.kst-ac-item',
+    'faq_items': '.kst-faq',
+    'faq_question': '.kst-faq-question',
+    'aria_expanded': 'aria-expanded',
+    'ac_panel': 'ac-panel',
+    'faq_active': 'faq-active',
+    'faq_answer': 'faq-answer',
+    'faq_item_open': 'faq-item-open',
+    'content_visibility': 'content-visibility',
+    'images': '인라인 이미지 추출',
+}
+
+
+def find_html_files(root_dir: str) -> List[str]:
+    """모든 HTML 파일 찾기 (정렬된 순서)"""
+    return sorted(comprehensive_accordion_fix.find_html_files(root_dir))
+
+
+def select_files(root_dir: str, profiles: List[str]) -> List[str]:
+    """선택한 프로파일에 속한 HTML 파일 목록"""
+    return [
+        path for path in find_html_files(root_dir)
+        if profile_for(path, root_dir) in profiles
+    ]
+
+
+def find_asset_files(assets_dir: str) -> List[str]:
+    """에셋 폴더의 모든 파일 (숨김 파일 제외)"""
+    asset_files = []
+    for root, dirs, files in os.walk(assets_dir):
+        for file in files:
+            if not file.startswith('.'):
+                asset_files.append(os.path.join(root, file))
+    return sorted(asset_files)
+
+
+def profile_for(file_path: str, root_dir: str) -> str:
+    """파일 위치에 따라 적용할 프로파일 결정"""
+    relative = os.path.relpath(file_path, root_dir)
+    top = relative.split(os.sep, 1)[0]
+    for profile, directory in PROFILE_DIRS.items():
+        if top == directory:
+            return profile
+    return 'root'
+
+
+def apply_rules(content: str, rules: List[Rule]) -> Tuple[str, Dict[str, int]]:
+    """메모리상의 내용에 규칙을 차례로 적용"""
+    stats = {}
+    for key, rule in rules:
+        mark_rule(key)
+        content, stats[key] = rule(content)
+    return content, stats
+
+
+# 규칙 외에 결과를 정하는 코드 (구조 검증/격리 판단, 바이트 경로) - 캐시에는 검증 결과도
+# 저장되므로 이 모듈 소스가 바뀌어도 규칙 버전이 달라져야 함
+PIPELINE_FUNCTIONS = (introduced_issues, process_file_bytes)
+
+
+def rules_version(rules: List[Rule]) -> str:
+    """규칙 체인 버전 - 규칙 순서나 규칙/검증기/바이트 경로 모듈 소스가 바뀌면 달라짐"""
+    digest = hashlib.sha1()
+    source_files = [inspect.getsourcefile(function) for function in PIPELINE_FUNCTIONS]
+    for key, rule in rules:
+        # 호출 가능한 객체로 된 단계(ImageExtractor 등)는 클래스 기준
+        target = rule if inspect.isfunction(rule) else type(rule)
+        digest.update(f'{key}:{target.__module__}.{target.__qualname__}\n'.encode('utf-8'))
+        source_file = inspect.getsourcefile(target)
+        if source_file not in source_files:
+            source_files.append(source_file)
+    for source_file in sorted(source_files):
+        with open(source_file, 'rb') as f:
+            digest.update(f.read())
+    return digest.hexdigest()[:12]
+
+
+def transform_content(content: str, rules: List[Rule]) -> Tuple[str, List[str]]:
+    """디스크에 쓰지 않고 규칙 적용 결과와 새로 생긴 구조 문제 반환"""
+    output, _ = apply_rules(content, rules)
+    if output == content:
+        return output, []
+    return output, introduced_issues(content, output)
+
+
+def process_file_text(file_path: str, rules: List[Rule], journal: UndoJournal = None,
+                      original_bytes: bytes = None, write: bool = True) -> dict:
+    """str 경로 - 파일 전체를 디코딩해 규칙 적용
+
+    write 가 False 이면 저장하지 않고 편집 목록만 돌려줍니다 (commit_pending 으로 반영).
+    """
+    if original_bytes is None:
+        with open(file_path, 'rb') as f:
+            original_bytes = f.read()
+    original_content = original_bytes.decode('utf-8')
+
+    content, stats = apply_rules(original_content, rules)
+
+    if content == original_content:
+        return {'modified': False, 'stats': stats}
+
+    # 쓰기 전에 구조 검증 - 수정으로 구조가 깨진 파일은 저장하지 않고 격리
+    mark_rule('verify')
+    issues = introduced_issues(original_content, content)
+    if issues:
+        return {
+            'modified': False,
+            'quarantined': True,
+            'issues': issues,
+            'stats': stats
+        }
+
+    new_bytes = content.encode('utf-8')
+    edits = diff_edits(original_bytes, new_bytes)
+    pre_hash = file_hash(original_bytes)
+    post_hash = file_hash(new_bytes)
+    if not write:
+        return pending_result(stats, edits, pre_hash, post_hash)
+    mark_rule('write')
+    if journal is not None:
+        journal.record_edits(file_path, pre_hash, post_hash, edits)
+    write_pieces(file_path, [new_bytes])
+    return {'modified': True, 'stats': stats, 'edits': edits, 'post_hash': post_hash}
+
+
+def pending_result(stats: Dict[str, int], edits: List[Tuple[int, bytes, bytes]],
+                   pre_hash: str, post_hash: str) -> dict:
+    """저장하지 않은 수정 결과 (부모 프로세스가 commit_pending 으로 반영)"""
+    return {'modified': True, 'pending': True, 'stats': stats, 'edits': edits,
+            'pre_hash': pre_hash, 'post_hash': post_hash}
+
+
+def apply_cached(file_path: str, original_bytes: bytes, key: str, cached: dict,
+                 journal: UndoJournal = None, write: bool = True) -> dict:
+    """캐시된 변환 결과를 규칙 적용 없이 그대로 반영"""
+    stats = dict(cached['stats'])
+    if cached['issues']:
+        return {
+            'modified': False,
+            'quarantined': True,
+            'issues': list(cached['issues']),
+            'stats': stats
+        }
+    if not cached['edits']:
+        return {'modified': False, 'stats': stats}
+
+    new_bytes = apply_edits(original_bytes, cached['edits'])
+    if file_hash(new_bytes) != cached['post_hash']:
+        raise ValueError('캐시 항목의 결과 해시가 맞지 않습니다')
+    if not write:
+        return pending_result(stats, cached['edits'], key, cached['post_hash'])
+    if journal is not None:
+        journal.record_edits(file_path, key, cached['post_hash'], cached['edits'])
+    write_pieces(file_path, [new_bytes])
+    return {'modified': True, 'stats': stats}
+
+
+def is_cacheable(rules: List[Rule]) -> bool:
+    """결과가 입력 내용만으로 정해지는 규칙 체인인지 (부수 효과가 있는 단계 제외)"""
+    return all(inspect.isfunction(rule) for _, rule in rules)
+
+
+def process_file(file_path: str, rules: List[Rule], journal: UndoJournal = None,
+                 fast_path: bool = True, cache: TransformCache = None,
+                 version: str = None, write: bool = True) -> dict:
+    """단일 파일 처리 - 한 번 읽고 모든 규칙 적용 후 한 번 저장
+
+    fast_path 이면 먼저 바이트 경로(bytes_rewrite)로 처리하고, 그 경로로 같은
+    결과를 보장할 수 없는 파일만 전체를 디코딩하는 str 경로로 처리합니다.
+    문서 단위 단계가 포함되면 항상 str 경로를 씁니다.
+
+    cache 가 있으면 (규칙 버전, 내용 해시)로 먼저 조회해, 같은 내용을 이미 변환한 적이
+    있으면 규칙을 다시 적용하지 않습니다.
+
+    write 가 False 이면 파일과 저널은 건드리지 않고, 수정할 파일은 편집 목록과
+    전후 해시를 담은 'pending' 결과로 돌려줍니다.
+    """
+    try:
+        original_bytes = None
+        key = None
+        if cache is not None:
+            with open(file_path, 'rb') as f:
+                original_bytes = f.read()
+            key = content_key(original_bytes)
+            cached = cache.get(version, key)
+            if cached is not None:
+                return apply_cached(file_path, original_bytes, key, cached, journal, write)
+
+        result = None
+        if fast_path and all(rule in FRAGMENT_RULES for _, rule in rules):
+            result = process_file_bytes(file_path, rules, journal, write)
+        if result is None:
+            result = process_file_text(file_path, rules, journal, original_bytes, write)
+
+        if cache is not None:
+            cache.put(version, key, result['stats'], result.get('issues', []),
+                      result.get('edits', []), result.get('post_hash', key))
+        return result
+
+    except Exception as e:
+        return {'modified': False, 'error': str(e)}
+
+
+def process_task(task: tuple) -> dict:
+    """예산 작업자에서 실행하는 단일 파일 처리
+
+    작업자는 파일을 쓰지 않고 편집 목록과 캐시 적중 여부만 돌려줍니다. 작업자가 언제
+    종료되더라도 페이지가 반쯤 쓰이거나 저널 없이 바뀌지 않도록, 저널 기록과 저장은
+    결과를 받은 부모가 합니다.
+    """
+    file_path, rules, fast_path, cache_dir, version = task
+    cache = TransformCache(cache_dir) if cache_dir else None
+    result = process_file(file_path, rules, None, fast_path, cache, version, write=False)
+    result['cache_hit'] = bool(cache is not None and cache.hits)
+    return result
+
+
+def run_budgeted(budget: BudgetRunner, file_path: str, rules: List[Rule],
+                 journal: UndoJournal = None, fast_path: bool = True,
+                 cache: TransformCache = None, version: str = None) -> dict:
+    """예산 작업자로 process_file 실행 (결과 형식은 process_file 과 같음)"""
+    cache_dir = cache.cache_dir if cache is not None else None
+    result = budget.submit((file_path, rules, fast_path, cache_dir, version))
+    if 'budget_exceeded' in result:
+        return {'modified': False, 'budget': budget_entry(file_path, result)}
+
+    if cache is not None:
+        if result.pop('cache_hit'):
+            cache.hits += 1
+        else:
+            cache.misses += 1
+    if result.get('pending'):
+        try:
+            return commit_pending(file_path, result, journal)
+        except OSError as e:
+            return {'modified': False, 'error': str(e)}
+    return result
+
+
+def run(root_dir: str, profiles: List[str], journal: UndoJournal = None,
+        fast_path: bool = True, shard: Tuple[int, int] = None,
+        stages: List[Rule] = (), cache: TransformCache = None,
+        budget: BudgetRunner = None) -> dict:
+    """선택한 프로파일로 전체 파일 처리 후 통합 통계 반환
+
+    shard 가 있으면 해당 몫만 처리하고, stages 는 프로파일 규칙 뒤에 이어서 적용합니다.
+    cache 는 부수 효과가 없는 규칙 체인에만 사용합니다.
+    budget 이 있으면 파일마다 예산 작업자에서 처리하고, 예산을 넘긴 파일은 격리합니다.
+    """
+    summary = {
+        'total_files': 0,
+        'profile_files': {profile: 0 for profile in profiles},
+        'total_stats': {},
+        'modified_files': [],
+        'error_files': [],
+        'quarantined_files': [],
+        'budget_exceeded': [],
+    }
+    for profile in profiles:
+        for key, _ in RULE_PROFILES[profile]:
+            summary['total_stats'].setdefault(key, 0)
+    for key, _ in stages:
+        summary['total_stats'].setdefault(key, 0)
+    # 프로파일별 규칙 버전 (캐시 키)
+    versions: Dict[str, str] = {}
+
+    html_files = find_html_files(root_dir)
+    if shard is not None:
+        html_files = shard_files(html_files, root_dir, shard)
+
+    for file_path in html_files:
+        profile = profile_for(file_path, root_dir)
+        if profile not in profiles:
+            continue
+        summary['total_files'] += 1
+        summary['profile_files'][profile] += 1
+
+        rules = RULE_PROFILES[profile] + list(stages)
+        file_cache = None
+        version = None
+        if cache is not None and is_cacheable(rules):
+            if profile not in versions:
+                versions[profile] = rules_version(rules)
+            file_cache = cache
+            version = versions[profile]
+        if budget is not None:
+            result = run_budgeted(budget, file_path, rules, journal, fast_path,
+                                  file_cache, version)
+        else:
+            result = process_file(file_path, rules, journal, fast_path, file_cache, version)
+        # 대기 결과가 있는 단계(이미지 추출 등)는 페이지가 저장된 경우에만 반영
+        for _, stage in stages:
+            if hasattr(stage, 'commit'):
+                if result.get('modified'):
+                    stage.commit()
+                else:
+                    stage.discard()
+        name = os.path.relpath(file_path, root_dir)
+
+        if 'budget' in result:
+            description = describe_budget_failure(result['budget'])
+            summary['budget_exceeded'].append(result['budget'])
+            summary['quarantined_files'].append((file_path, [description]))
+            print(f"⏱️ 격리: {name} - {description}")
+        elif 'error' in result:
+            summary['error_files'].append((file_path, result['error']))
+            print(f"❌ 오류: {name} - {result['error']}")
+        elif result.get('quarantined'):
+            summary['quarantined_files'].append((file_path, result['issues']))
+            print(f"🚧 격리: {name} - 구조 검증 실패 {len(result['issues'])}건")
+        elif result['modified']:
+            summary['modified_files'].append(file_path)
+            stats = result['stats']
+            for key, value in stats.items():
+                summary['total_stats'][key] += value
+
+            changes = [
+                f"{STAT_LABELS[key]}: {value}"
+                for key, value in stats.items() if value > 0
+            ]
+            if changes:
+                print(f"✅ {name} - {', '.join(changes)}")
+
+    return summary
+
+
+def print_summary(summary: dict, journal: UndoJournal = None) -> None:
+    """통합 요약 출력"""
+    print("\n" + "=" * 70)
+    print("📊 수정 완료 요약")
+    print("=" * 70)
+    print(f"총 파일 수: {summary['total_files']}")
+    for profile, count in summary['profile_files'].items():
+        print(f"  - {profile}: {count}")
+    print(f"수정된 파일: {len(summary['modified_files'])}")
+    print(f"오류 발생: {len(summary['error_files'])}")
+    print(f"격리된 파일: {len(summary['quarantined_files'])}")
+    if journal is not None and journal.entries:
+        print(f"되돌리기: python kstation.py undo {journal.run_id}")
+    print(f"\n총 변경 사항:")
+    for key, value in summary['total_stats'].items():
+        print(f"  - {STAT_LABELS[key]}: {value}개")
+
+    if summary['error_files']:
+        print(f"\n⚠️ 오류 발생 파일:")
+        for file_path, error in summary['error_files']:
+            print(f"  - {os.path.basename(file_path)}: {error}")
+
+    if summary['quarantined_files']:
+        print(f"\n🚧 격리된 파일 (저장하지 않음):")
+        for file_path, issues in summary['quarantined_files']:
+            print(f"  - {os.path.basename(file_path)}:")
+            for issue in issues:
+                print(f"      {issue}")
+
+
+def shard_argument(value: str) -> Tuple[int, int]:
+    """--shard 인자 해석 (argparse 용 오류 변환)"""
+    try:
+        return parse_shard(value)
+    except ValueError as e:
+        raise argparse.ArgumentTypeError(str(e))
+
+
+def main():
+    """메인 함수"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--root', default=os.path.dirname(os.path.abspath(__file__)),
+                        help='HTML 파일을 찾을 최상위 폴더 (기본: 스크립트 폴더)')
+    # `kstation.py run --root DIR` 처럼 하위 명령 뒤에도 --root 를 쓸 수 있도록
+    # (지정하지 않으면 최상위 값을 덮어쓰지 않음)
+    root_option = argparse.ArgumentParser(add_help=False)
+    root_option.add_argument('--root', default=argparse.SUPPRESS,
+                             help='HTML 파일을 찾을 최상위 폴더 (기본: 스크립트 폴더)')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    run_parser = subparsers.add_parser('run', parents=[root_option], help='규칙 프로파일 적용')
+    run_parser.add_argument('--profile', choices=['all'] + list(RULE_PROFILES),
+                            default='all', help='적용할 규칙 프로파일 (기본: all)')
+    run_parser.add_argument('--no-fast-path', action='store_true',
+                            help='바이트 경로를 쓰지 않고 모든 파일을 디코딩해 처리')
+    run_parser.add_argument('--content-visibility', action='store_true',
+                            help='첫 화면 이후 .kst-section 에 content-visibility: auto 주입')
+    run_parser.add_argument('--extract-images', action='store_true',
+                            help='인라인 data:image URI 를 해시 이름 파일로 추출')
+    run_parser.add_argument('--assets-dir', metavar='DIR',
+                            help=f'추출한 이미지 저장 폴더 (기본: 루트/{ASSETS_DIR})')
+    run_parser.add_argument('--asset-base-url', metavar='URL', default='/' + ASSETS_DIR,
+                            help=f'페이지에서 이미지를 참조할 URL 접두사 (기본: /{ASSETS_DIR})')
+    run_parser.add_argument('--inline-below', metavar='BYTES', type=int, default=0,
+                            help='이보다 작은 이미지는 인라인으로 유지 (기본: 0)')
+    run_parser.add_argument('--cache', action='store_true',
+                            help='(규칙 버전, 내용 해시) 변환 캐시 사용 - 같은 문서는 한 번만 변환')
+    run_parser.add_argument('--cache-dir', metavar='DIR',
+                            help=f'변환 캐시 위치 (기본: 루트/{CACHE_DIR})')
+    run_parser.add_argument('--time-limit', metavar='SECONDS', type=float,
+                            help='파일당 처리 시간 예산 - 넘기면 작업자를 교체하고 파일 격리')
+    run_parser.add_argument('--memory-limit', metavar='MB', type=int,
+                            help='파일당 작업자 메모리 예산 (--time-limit 과 함께 사용, '
+                                 f'기본: {DEFAULT_MEMORY_LIMIT_MB})')
+    run_parser.add_argument('--shard', metavar='I/N', type=shard_argument,
+                            help='파일을 N 개로 나눈 중 I 번째 몫만 처리 (1부터)')
+    run_parser.add_argument('--stats-out', metavar='PATH',
+                            help='통계 산출물(JSON) 저장 위치 '
+                                 '(--shard 사용 시 기본: .kstation/stats/ 아래)')
+
+    merge_parser = subparsers.add_parser('merge', parents=[root_option], help='샤드 통계 산출물 병합')
+    merge_parser.add_argument('artifacts', metavar='SHARD_STATS', nargs='+')
+
+    serve_parser = subparsers.add_parser('serve', parents=[root_option], help='규칙 적용 결과 미리보기 서버')
+    serve_parser.add_argument('--host', default='127.0.0.1')
+    serve_parser.add_argument('--port', type=int, default=8000)
+    serve_parser.add_argument('--cache-size', type=int, default=256,
+                              help='변환 결과 LRU 캐시 항목 수 (기본: 256)')
+    serve_parser.add_argument('--content-visibility', action='store_true',
+                              help='content-visibility 단계도 적용해 미리보기')
+    serve_parser.add_argument('--profile', choices=['all'] + list(RULE_PROFILES),
+                              default='all', help='목차에 보일 프로파일 (기본: all)')
+
+    publish_parser = subparsers.add_parser('publish', parents=[root_option],
+                                           help='콘텐츠 해시 이름 + .gz 배포 출력')
+    publish_parser.add_argument('--profile', choices=['all'] + list(RULE_PROFILES),
+                                default='all', help='배포할 페이지 프로파일 (기본: all)')
+    publish_parser.add_argument('--out', metavar='DIR',
+                                help=f'배포 폴더 (기본: 루트/{PUBLISH_DIR})')
+    publish_parser.add_argument('--assets', metavar='DIR',
+                                help=f'함께 배포할 에셋 폴더 (기본: 루트/{ASSETS_DIR} 가 있으면 사용)')
+
+    dupes_parser = subparsers.add_parser('dupes', parents=[root_option],
+                                         help='템플릿을 공유하는 거의 같은 페이지 그룹 보고')
+    dupes_parser.add_argument('--profile', choices=['all'] + list(RULE_PROFILES),
+                              default='all', help='검사할 페이지 프로파일 (기본: all)')
+    dupes_parser.add_argument('--threshold', type=float, default=DEFAULT_THRESHOLD,
+                              help=f'같은 그룹으로 볼 추정 유사도 (기본: {DEFAULT_THRESHOLD})')
+    dupes_parser.add_argument('--json', metavar='PATH', help='그룹 결과를 JSON 으로 저장')
+
+    census_parser = subparsers.add_parser('census', parents=[root_option],
+                                          help='아코디언/FAQ 구현 변형 조사 보고서')
+    census_parser.add_argument('--profile', choices=['all'] + list(RULE_PROFILES),
+                               default='all', help='조사할 페이지 프로파일 (기본: all)')
+    census_parser.add_argument('--jobs', type=int,
+                               help='분류 프로세스 수 (기본: CPU 수, 1 이면 병렬 처리 안 함)')
+    census_parser.add_argument('--json', metavar='PATH',
+                               help=f'JSON 저장 위치 (기본: 루트/{CENSUS_DIR}/{CENSUS_JSON})')
+    census_parser.add_argument('--markdown', metavar='PATH',
+                               help=f'Markdown 보고서 위치 (기본: 루트/{CENSUS_DIR}/{CENSUS_MARKDOWN})')
+
+    undo_parser = subparsers.add_parser('undo', parents=[root_option], help='저널로 실행 되돌리기')
+    undo_parser.add_argument('run_id', metavar='RUN_ID')
+
+    args = parser.parse_args()
+    root_dir = os.path.abspath(args.root)
+    journal_dir = os.path.join(root_dir, JOURNAL_DIR)
+
+    if args.command == 'undo':
+        try:
+            result = undo_run(journal_dir, args.run_id)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            return
+        print_undo_report(args.run_id, result)
+        return
+
+    if args.command == 'merge':
+        try:
+            summary, warnings = merge_artifacts([load_artifact(path) for path in args.artifacts])
+        except (OSError, ValueError) as e:
+            print(f"❌ 병합 실패: {e}")
+            return
+        print(f"📦 샤드 산출물 {len(args.artifacts)}개 병합")
+        for warning in warnings:
+            print(f"⚠️ {warning}")
+        print_summary(summary)
+        return
+
+    profiles = list(RULE_PROFILES) if args.profile == 'all' else [args.profile]
+
+    stages = [STAGES['content_visibility']] if getattr(args, 'content_visibility', False) else []
+
+    if args.command == 'serve':
+        def transform(file_path: str, content: str) -> Tuple[str, List[str]]:
+            rules = RULE_PROFILES[profile_for(file_path, root_dir)] + stages
+            return transform_content(content, rules)
+
+        all_rules = [rule for profile in profiles for rule in RULE_PROFILES[profile]] + stages
+        serve(root_dir, select_files(root_dir, profiles), transform, rules_version(all_rules),
+              args.host, args.port, args.cache_size)
+        return
+
+    if args.command == 'dupes':
+        result = find_near_duplicates(root_dir, select_files(root_dir, profiles), args.threshold)
+        print_near_duplicate_report(result)
+        if args.json:
+            with open(args.json, 'w', encoding='utf-8') as f:
+                json.dump({key: value for key, value in result.items() if key != 'errors'},
+                          f, ensure_ascii=False, indent=2)
+                f.write('\n')
+            print(f"\n📝 그룹 결과: {args.json}")
+        return
+
+    if args.command == 'census':
+        census = run_census(root_dir, select_files(root_dir, profiles), args.jobs)
+        print_census_report(census)
+        json_path = args.json or os.path.join(root_dir, CENSUS_DIR, CENSUS_JSON)
+        markdown_path = args.markdown or os.path.join(root_dir, CENSUS_DIR, CENSUS_MARKDOWN)
+        write_census_json(census, json_path)
+        os.makedirs(os.path.dirname(os.path.abspath(markdown_path)), exist_ok=True)
+        with open(markdown_path, 'w', encoding='utf-8') as f:
+            f.write(render_markdown(census))
+        print(f"\n📝 JSON: {json_path}")
+        print(f"📝 Markdown: {markdown_path}")
+        return
+
+    if args.command == 'publish':
+        out_dir = os.path.abspath(args.out or os.path.join(root_dir, PUBLISH_DIR))
+        assets_dir = args.assets or os.path.join(root_dir, ASSETS_DIR)
+        asset_files = find_asset_files(assets_dir) if os.path.isdir(assets_dir) else []
+        result = publish(root_dir, select_files(root_dir, profiles), out_dir, asset_files)
+        print_publish_report(out_dir, result)
+        return
+
+    print(f"📁 대상 폴더: {root_dir}")
+    print("=" * 70)
+    print(f"아코디언/FAQ 규칙 적용 중... (프로파일: {', '.join(profiles)})")
+    if args.shard:
+        print(f"샤드: {args.shard[0]}/{args.shard[1]}")
+    print("=" * 70)
+
+    extractor = None
+    if args.extract_images:
+        extractor = ImageExtractor(
+            os.path.abspath(args.assets_dir or os.path.join(root_dir, ASSETS_DIR)),
+            args.asset_base_url, args.inline_below
+        )
+        stages.append(('images', extractor))
+
+    cache = None
+    if args.cache:
+        cache = TransformCache(os.path.abspath(args.cache_dir or os.path.join(root_dir, CACHE_DIR)))
+
+    budget = None
+    if args.time_limit or args.memory_limit:
+        if extractor is not None:
+            parser.error('--extract-images 는 예산 작업자(--time-limit/--memory-limit)와 '
+                         '함께 쓸 수 없습니다')
+        budget = BudgetRunner(process_task, args.time_limit or float('inf'),
+                              args.memory_limit or DEFAULT_MEMORY_LIMIT_MB)
+
+    journal = UndoJournal(journal_dir)
+    try:
+        summary = run(root_dir, profiles, journal, not args.no_fast_path, args.shard, stages,
+                      cache, budget)
+    finally:
+        if budget is not None:
+            budget.close()
+    print_summary(summary, journal)
+    if summary['budget_exceeded']:
+        quarantine_path = save_budget_quarantine(summary['budget_exceeded'], root_dir,
+                                                 journal.run_id)
+        print(f"\n⏱️ 예산 초과 {len(summary['budget_exceeded'])}개 "
+              f"(작업자 교체 {budget.replaced}회): {quarantine_path}")
+    if cache is not None:
+        print(f"\n🗃️ 변환 캐시: 적중 {cache.hits} / 미적중 {cache.misses}")
+    if extractor is not None:
+        extractor.print_report()
+
+    stats_out = args.stats_out
+    if stats_out is None and args.shard:
+        stats_out = os.path.join(
+            root_dir, STATS_DIR,
+            f'{journal.run_id}.shard-{args.shard[0]}-of-{args.shard[1]}.json'
+        )
+    if stats_out:
+        artifact = summary_to_artifact(summary, root_dir, args.shard or (1, 1),
+                                       profiles, journal.run_id)
+        write_artifact(artifact, stats_out)
+        print(f"\n📝 통계 산출물: {stats_out}")
+
+
+if __name__ == '__main__':
+    main()
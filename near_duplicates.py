@@ -0,0 +1,173 @@
+#!/usr/bin/env python3
+"""
+템플릿을 공유하는 거의 같은 페이지 묶음 보고서 (shingle + MinHash)
+
+제품 페이지는 같은 템플릿을 복사해 만든 것이 많아 규칙 체인이 같은 구조를 반복해서
+처리합니다 (예: 69-wondertox-200unit-1-vial.html /
+70-product-info-wondertox-100unit-1-vial.html). 제품마다 문구와 색상은 달라도 템플릿은
+태그/클래스 순서로 드러나므로, `태그.클래스` 토큰 열의 shingle 로 MinHash 서명을 만들고
+LSH 밴드로 묶어 후보 쌍만 비교한 뒤 추정 유사도가 기준 이상인 파일을 하나의 그룹으로
+보고합니다. 내용이 완전히 같은 파일은 변환 캐시에서 한 번만 처리되고, 거의 같은
+그룹은 규칙 수정 시 함께 확인할 대상입니다.
+"""
+
+import hashlib
+import os
+import re
+import struct
+from collections import defaultdict
+from typing import Dict, List, Tuple
+
+SHINGLE_SIZE = 4
+NUM_PERMUTATIONS = 64
+BANDS = 16
+DEFAULT_THRESHOLD = 0.8
+
+# 2^61 - 1 (메르센 소수) 위의 (a * x + b) mod p 해시 족
+MERSENNE_PRIME = (1 << 61) - 1
+MAX_HASH = (1 << 32) - 1
+
+TAG_PATTERN = re.compile(r'<\s*(/?)([a-zA-Z][a-zA-Z0-9-]*)([^>]*)>')
+CLASS_PATTERN = re.compile(r'\bclass\s*=\s*["\']([^"\']*)["\']', re.IGNORECASE)
+SCRIPT_STYLE_PATTERN = re.compile(r'<(script|style)\b.*?</\1\s*>', re.IGNORECASE | re.DOTALL)
+
+
+def _permutations(count: int) -> List[Tuple[int, int]]:
+    """실행마다 같은 (a, b) 계수 - 결과가 재현 가능하도록 고정 시드에서 생성"""
+    params = []
+    for i in range(count):
+        digest = hashlib.blake2b(f'kstation-minhash-{i}'.encode('ascii'), digest_size=16).digest()
+        a, b = struct.unpack('<QQ', digest)
+        params.append((a % (MERSENNE_PRIME - 1) + 1, b % MERSENNE_PRIME))
+    return params
+
+
+PERMUTATIONS = _permutations(NUM_PERMUTATIONS)
+
+
+def structure_tokens(content: str) -> List[str]:
+    """script/style 을 뺀 태그 열 (`/태그` 또는 `태그.클래스1.클래스2`)"""
+    tokens = []
+    for match in TAG_PATTERN.finditer(SCRIPT_STYLE_PATTERN.sub(' ', content)):
+        token = match.group(1) + match.group(2).lower()
+        class_match = CLASS_PATTERN.search(match.group(3))
+        if class_match:
+            token += ''.join('.' + name for name in sorted(class_match.group(1).split()))
+        tokens.append(token)
+    return tokens
+
+
+def shingles(content: str, size: int = SHINGLE_SIZE) -> set:
+    """구조 토큰 size-gram 의 32비트 해시 집합"""
+    tokens = structure_tokens(content)
+    if len(tokens) < size:
+        tokens = tokens + [''] * (size - len(tokens))
+    return {
+        int.from_bytes(hashlib.blake2b('\0'.join(tokens[i:i + size]).encode('utf-8'),
+                                       digest_size=4).digest(), 'little')
+        for i in range(len(tokens) - size + 1)
+    }
+
+
+def minhash(shingle_set: set) -> Tuple[int, ...]:
+    """shingle 집합의 MinHash 서명"""
+    return tuple(
+        min((a * x + b) % MERSENNE_PRIME & MAX_HASH for x in shingle_set)
+        for a, b in PERMUTATIONS
+    )
+
+
+def similarity(signature_a: Tuple[int, ...], signature_b: Tuple[int, ...]) -> float:
+    """두 서명이 같은 비율 (자카드 유사도 추정값)"""
+    same = sum(1 for x, y in zip(signature_a, signature_b) if x == y)
+    return same / len(signature_a)
+
+
+def _find(parent: Dict[str, str], item: str) -> str:
+    while parent[item] != item:
+        parent[item] = parent[parent[item]]
+        item = parent[item]
+    return item
+
+
+def find_near_duplicates(root_dir: str, html_files: List[str],
+                         threshold: float = DEFAULT_THRESHOLD) -> dict:
+    """거의 같은 파일 그룹 계산
+
+    반환값: {'groups': [{'files', 'exact', 'similarity'}], 'files': 검사한 파일 수, 'errors'}
+    """
+    signatures: Dict[str, Tuple[int, ...]] = {}
+    digests: Dict[str, str] = {}
+    errors = []
+    for file_path in sorted(html_files):
+        relative = os.path.relpath(file_path, root_dir).replace(os.sep, '/')
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            errors.append((file_path, str(e)))
+            continue
+        digests[relative] = hashlib.sha256(data).hexdigest()
+        signatures[relative] = minhash(shingles(data.decode('utf-8', errors='replace')))
+
+    # LSH: 밴드 하나라도 완전히 같은 파일끼리만 후보 쌍으로 비교
+    rows = NUM_PERMUTATIONS // BANDS
+    buckets = defaultdict(list)
+    for relative, signature in signatures.items():
+        for band in range(BANDS):
+            buckets[(band, signature[band * rows:(band + 1) * rows])].append(relative)
+
+    parent = {relative: relative for relative in signatures}
+    pair_scores: Dict[Tuple[str, str], float] = {}
+    for members in buckets.values():
+        for i, first in enumerate(members):
+            for second in members[i + 1:]:
+                pair = (first, second)
+                if pair in pair_scores:
+                    continue
+                if digests[first] == digests[second]:
+                    score = 1.0
+                else:
+                    score = similarity(signatures[first], signatures[second])
+                pair_scores[pair] = score
+                if score >= threshold:
+                    parent[_find(parent, second)] = _find(parent, first)
+
+    members_by_root = defaultdict(list)
+    for relative in signatures:
+        members_by_root[_find(parent, relative)].append(relative)
+
+    groups = []
+    for members in members_by_root.values():
+        if len(members) < 2:
+            continue
+        scores = [score for (a, b), score in pair_scores.items()
+                  if score >= threshold and a in members and b in members]
+        groups.append({
+            'files': sorted(members),
+            'exact': len({digests[m] for m in members}) == 1,
+            'similarity': round(min(scores), 3) if scores else 1.0,
+        })
+    groups.sort(key=lambda group: (-len(group['files']), group['files'][0]))
+    return {'groups': groups, 'files': len(signatures), 'threshold': threshold,
+            'errors': errors}
+
+
+def print_near_duplicate_report(result: dict) -> None:
+    """거의 같은 파일 그룹 출력"""
+    groups = result['groups']
+    grouped = sum(len(group['files']) for group in groups)
+    print("=" * 70)
+    print(f"🧬 거의 같은 페이지 그룹 (유사도 {result['threshold']:.0%} 이상)")
+    print("=" * 70)
+    print(f"검사한 파일: {result['files']}")
+    print(f"그룹: {len(groups)}개 ({grouped}개 파일)")
+    for number, group in enumerate(groups, 1):
+        kind = '완전히 같음' if group['exact'] else f"최소 유사도 {group['similarity']:.0%}"
+        print(f"\n[{number}] {len(group['files'])}개 - {kind}")
+        for relative in group['files']:
+            print(f"  - {relative}")
+    if result['errors']:
+        print(f"\n⚠️ 오류 발생 파일:")
+        for file_path, error in result['errors']:
+            print(f"  - {os.path.basename(file_path)}: {error}")
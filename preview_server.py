@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+규칙 적용 결과를 바로 확인하는 로컬 미리보기 서버
+
+요청이 들어오면 원본 파일에 process_file 과 같은 규칙 체인을 메모리에서 적용해
+응답합니다 (디스크의 파일은 바꾸지 않음).
+- 변환 결과는 (경로, mtime, 규칙 버전) 키의 LRU 캐시에 저장
+- ETag 도 같은 키로 만들므로, 변경 없는 파일은 변환 없이 304 로 응답
+- / 는 find_html_files 로 만든 목차 페이지
+"""
+
+import hashlib
+import html
+import mimetypes
+import os
+import threading
+from collections import OrderedDict
+from http import HTTPStatus
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, List, Optional, Tuple
+from urllib.parse import quote, unquote, urlsplit
+
+# transform(파일 경로, 원본 내용) -> (변환 결과, 구조 문제 목록)
+Transform = Callable[[str, str], Tuple[str, List[str]]]
+
+
+class LRUCache:
+    """스레드 안전한 단순 LRU 캐시"""
+
+    def __init__(self, max_entries: int = 256):
+        self.max_entries = max_entries
+        self.entries = OrderedDict()
+        self.lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key):
+        with self.lock:
+            if key not in self.entries:
+                self.misses += 1
+                return None
+            self.entries.move_to_end(key)
+            self.hits += 1
+            return self.entries[key]
+
+    def put(self, key, value) -> None:
+        with self.lock:
+            self.entries[key] = value
+            self.entries.move_to_end(key)
+            while len(self.entries) > self.max_entries:
+                self.entries.popitem(last=False)
+
+
+class PreviewServer(ThreadingHTTPServer):
+    """미리보기 서버 (설정과 캐시 보관)"""
+
+    daemon_threads = True
+
+    def __init__(self, address, root_dir: str, html_files: List[str],
+                 transform: Transform, rules_version: str, cache_size: int = 256):
+        super().__init__(address, PreviewRequestHandler)
+        self.root_dir = os.path.abspath(root_dir)
+        self.html_files = html_files
+        self.transform = transform
+        self.rules_version = rules_version
+        self.cache = LRUCache(cache_size)
+
+
+class PreviewRequestHandler(BaseHTTPRequestHandler):
+    """목차, 변환된 HTML, 정적 파일 응답"""
+
+    server: PreviewServer
+
+    def do_GET(self):
+        self.handle_request(send_body=True)
+
+    def do_HEAD(self):
+        self.handle_request(send_body=False)
+
+    def handle_request(self, send_body: bool) -> None:
+        path = unquote(urlsplit(self.path).path)
+        if path in ('', '/'):
+            self.send_bytes(self.render_index(), 'text/html; charset=utf-8', send_body)
+            return
+
+        file_path = self.resolve(path)
+        if file_path is None:
+            self.send_error(HTTPStatus.NOT_FOUND)
+            return
+
+        stat = os.stat(file_path)
+        etag = self.make_etag(file_path, stat)
+        if etag in self.headers.get('If-None-Match', ''):
+            self.send_response(HTTPStatus.NOT_MODIFIED)
+            self.send_header('ETag', etag)
+            self.end_headers()
+            return
+
+        if file_path.endswith('.html'):
+            try:
+                body, issues = self.transformed(file_path, stat)
+            except UnicodeDecodeError as e:
+                # 응답 없이 연결이 끊기지 않도록 process_file 처럼 파일 이름과 함께 보고
+                relative = os.path.relpath(file_path, self.server.root_dir)
+                self.send_error(HTTPStatus.INTERNAL_SERVER_ERROR,
+                                explain=f'{relative}: UTF-8 로 읽을 수 없습니다 ({e})')
+                return
+            extra = {'X-Kstation-Issues': str(len(issues))}
+            self.send_bytes(body, 'text/html; charset=utf-8', send_body, etag, extra)
+        else:
+            with open(file_path, 'rb') as f:
+                body = f.read()
+            content_type = mimetypes.guess_type(file_path)[0] or 'application/octet-stream'
+            self.send_bytes(body, content_type, send_body, etag)
+
+    def resolve(self, path: str) -> Optional[str]:
+        """요청 경로를 루트 폴더 안의 실제 파일로 변환 (밖으로 나가면 None)"""
+        root_dir = self.server.root_dir
+        file_path = os.path.abspath(os.path.join(root_dir, path.lstrip('/')))
+        if os.path.commonpath([root_dir, file_path]) != root_dir:
+            return None
+        relative = os.path.relpath(file_path, root_dir)
+        if any(part.startswith('.') for part in relative.split(os.sep)):
+            return None
+        if not os.path.isfile(file_path):
+            return None
+        return file_path
+
+    def make_etag(self, file_path: str, stat: os.stat_result) -> str:
+        """(경로, mtime, 크기, 규칙 버전) 기반 ETag - 변환 전에 계산 가능"""
+        key = f'{file_path}\0{stat.st_mtime_ns}\0{stat.st_size}\0{self.server.rules_version}'
+        return '"' + hashlib.sha1(key.encode('utf-8')).hexdigest() + '"'
+
+    def transformed(self, file_path: str, stat: os.stat_result) -> Tuple[bytes, List[str]]:
+        """캐시를 거쳐 변환 결과 반환"""
+        key = (file_path, stat.st_mtime_ns, self.server.rules_version)
+        cached = self.server.cache.get(key)
+        if cached is not None:
+            return cached
+        with open(file_path, 'r', encoding='utf-8', newline='') as f:
+            content = f.read()
+        output, issues = self.server.transform(file_path, content)
+        value = (output.encode('utf-8'), issues)
+        self.server.cache.put(key, value)
+        return value
+
+    def render_index(self) -> bytes:
+        """find_html_files 결과로 만든 목차 페이지"""
+        root_dir = self.server.root_dir
+        cache = self.server.cache
+        items = []
+        for file_path in self.server.html_files:
+            relative = os.path.relpath(file_path, root_dir).replace(os.sep, '/')
+            items.append(
+                f'<li><a href="/{quote(relative)}">{html.escape(relative)}</a></li>'
+            )
+        page = (
+            '<!DOCTYPE html>\n<html lang="ko">\n<head>\n<meta charset="utf-8">\n'
+            '<title>kstation 미리보기</title>\n</head>\n<body>\n'
+            f'<h1>kstation 미리보기 ({len(items)}개)</h1>\n'
+            f'<p>규칙 버전 {html.escape(self.server.rules_version)} · '
+            f'캐시 {len(cache.entries)}개 (적중 {cache.hits} / 미적중 {cache.misses})</p>\n'
+            '<ul>\n' + '\n'.join(items) + '\n</ul>\n</body>\n</html>\n'
+        )
+        return page.encode('utf-8')
+
+    def send_bytes(self, body: bytes, content_type: str, send_body: bool,
+                   etag: str = None, extra_headers: dict = None) -> None:
+        self.send_response(HTTPStatus.OK)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        if etag:
+            self.send_header('ETag', etag)
+            self.send_header('Cache-Control', 'no-cache')
+        for name, value in (extra_headers or {}).items():
+            self.send_header(name, value)
+        self.end_headers()
+        if send_body:
+            self.wfile.write(body)
+
+
+def serve(root_dir: str, html_files: List[str], transform: Transform, rules_version: str,
+          host: str = '127.0.0.1', port: int = 8000, cache_size: int = 256) -> None:
+    """미리보기 서버 실행 (Ctrl+C 로 종료)"""
+    server = PreviewServer((host, port), root_dir, html_files, transform,
+                           rules_version, cache_size)
+    print(f"🔎 미리보기 서버: http://{host}:{server.server_address[1]}/")
+    print(f"📁 대상 폴더: {server.root_dir} ({len(html_files)}개 페이지)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n미리보기 서버를 종료합니다.")
+    finally:
+        server.server_close()
@@ -0,0 +1,197 @@
+#!/usr/bin/env python3
+"""
+CDN/정적 미리보기 배포용 출력 (콘텐츠 해시 파일명 + 미리 압축한 .gz)
+
+처리된 페이지와 추출된 에셋을 `<이름>.<해시>.<확장자>` 로 쓰고, zlib 최대 압축
+레벨로 만든 `.gz` 를 옆에 둡니다. manifest.json 은 제품 slug -> 해시 파일명을
+기록합니다. 내용이 같으면 해시도 같으므로 이미 있는 파일은 다시 쓰지 않고,
+CDN 캐시와 업로드 단계도 그대로 건너뛸 수 있습니다.
+"""
+
+import hashlib
+import json
+import os
+import re
+import zlib
+from typing import Dict, List, Tuple
+
+# 루트 폴더 기준 기본 배포 위치
+PUBLISH_DIR = os.path.join('.kstation', 'publish')
+
+MANIFEST_NAME = 'manifest.json'
+
+HASH_LENGTH = 12
+
+# 미리 압축할 확장자 (이미지는 이미 압축되어 있으므로 제외)
+COMPRESSIBLE_EXTENSIONS = {'.html', '.css', '.js', '.json', '.svg', '.txt'}
+
+
+def slugify(name: str, separator: str = '-') -> str:
+    """파일명을 slug 로 변환 (complete-shopify/rename_html.py 와 같은 규칙)"""
+    slug = name.lower().replace(' ', separator).replace('_', separator)
+    slug = re.sub(f'[^{re.escape(separator)}a-z0-9]', '', slug)
+    slug = re.sub(f'{re.escape(separator)}{{2,}}', separator, slug)
+    return slug.strip(separator)
+
+
+def content_hash(data: bytes) -> str:
+    """파일명에 쓰는 짧은 콘텐츠 해시"""
+    return hashlib.sha256(data).hexdigest()[:HASH_LENGTH]
+
+
+def gzip_bytes(data: bytes) -> bytes:
+    """zlib 최대 레벨 gzip 압축 (헤더 시각이 0 이라 같은 입력은 같은 출력)"""
+    compressor = zlib.compressobj(9, zlib.DEFLATED, 31, 9)
+    return compressor.compress(data) + compressor.flush()
+
+
+def _write_if_missing(path: str, data: bytes) -> bool:
+    """파일이 없을 때만 기록 (해시 이름이므로 있으면 내용이 같음)"""
+    if os.path.exists(path):
+        return False
+    temp_path = path + '.tmp'
+    with open(temp_path, 'wb') as f:
+        f.write(data)
+    os.replace(temp_path, path)
+    return True
+
+
+def hashed_name(data: bytes, stem: str, extension: str) -> str:
+    """`<이름>.<해시><확장자>` - 이름이 이미 내용 해시면 해시를 다시 붙이지 않음"""
+    if stem == content_hash(data):
+        return stem + extension
+    return f'{stem}.{content_hash(data)}{extension}'
+
+
+def page_slug(relative: str) -> str:
+    """manifest 의 페이지 키 - 하위 폴더 페이지는 항상 폴더 이름을 붙임
+
+    선택한 프로파일이나 정렬 순서와 관계없이 같은 페이지는 항상 같은 키를 가집니다.
+    (예: complete-shopify/03-cartin.html -> complete-shopify-03-cartin)
+    """
+    directory, file_name = os.path.split(relative)
+    slug = slugify(os.path.splitext(file_name)[0])
+    if directory:
+        slug = slugify(directory.replace('/', '-')) + '-' + slug
+    return slug
+
+
+def publish_bytes(data: bytes, file_name: str, out_dir: str) -> Tuple[dict, bool]:
+    """해시 이름으로 기록 (+ .gz) 후 (manifest 항목, 새로 썼는지) 반환"""
+    extension = os.path.splitext(file_name)[1]
+    written = _write_if_missing(os.path.join(out_dir, file_name), data)
+    entry = {'file': file_name, 'size': len(data)}
+
+    if extension in COMPRESSIBLE_EXTENSIONS:
+        gzip_name = file_name + '.gz'
+        gzip_path = os.path.join(out_dir, gzip_name)
+        if written or not os.path.exists(gzip_path):
+            compressed = gzip_bytes(data)
+            _write_if_missing(gzip_path, compressed)
+            entry['gzip_size'] = len(compressed)
+        else:
+            entry['gzip_size'] = os.path.getsize(gzip_path)
+        entry['gzip'] = gzip_name
+    return entry, written
+
+
+def publish(root_dir: str, html_files: List[str], out_dir: str,
+            asset_files: List[str] = ()) -> dict:
+    """페이지와 에셋을 배포 폴더에 기록하고 manifest 갱신
+
+    에셋은 먼저 배포하고, 페이지 안의 에셋 참조(루트 기준 상대 경로)를 해시 이름으로
+    바꾼 뒤 페이지를 배포합니다. 에셋 내용이 바뀌면 참조하는 페이지 해시도 바뀝니다.
+    """
+    os.makedirs(out_dir, exist_ok=True)
+    manifest = {'pages': {}, 'assets': {}}
+    result = {'written': [], 'unchanged': [], 'errors': []}
+
+    asset_refs: Dict[str, str] = {}
+    for asset_path in sorted(asset_files):
+        relative = os.path.relpath(asset_path, root_dir).replace(os.sep, '/')
+        stem, extension = os.path.splitext(os.path.basename(asset_path))
+        try:
+            with open(asset_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            result['errors'].append((asset_path, str(e)))
+            continue
+        # 이미 해시 이름인 에셋(이미지 추출 결과 등)은 이름을 그대로 사용
+        if stem != content_hash(data):
+            stem = slugify(stem)
+        entry, written = publish_bytes(data, hashed_name(data, stem, extension.lower()),
+                                       out_dir)
+        manifest['assets'][relative] = entry
+        asset_refs[relative] = entry['file']
+        result['written' if written else 'unchanged'].append(entry['file'])
+
+    for file_path in sorted(html_files):
+        relative = os.path.relpath(file_path, root_dir).replace(os.sep, '/')
+        slug = page_slug(relative)
+        if slug in manifest['pages']:
+            result['errors'].append(
+                (file_path, f"slug 충돌: {slug} ({manifest['pages'][slug]['source']})")
+            )
+            continue
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            result['errors'].append((file_path, str(e)))
+            continue
+
+        page_dir = os.path.dirname(relative)
+        for asset_relative, published_name in asset_refs.items():
+            # 루트 기준(/assets/...) 참조와 페이지 위치 기준 상대 참조를
+            # 배포 폴더 평면 구조의 이름으로 교체
+            references = (
+                '/' + asset_relative,
+                os.path.relpath(asset_relative, page_dir or '.').replace(os.sep, '/'),
+            )
+            for reference in references:
+                data = data.replace(reference.encode('utf-8'), published_name.encode('utf-8'))
+
+        entry, written = publish_bytes(data, hashed_name(data, slug, '.html'), out_dir)
+        entry['source'] = relative
+        manifest['pages'][slug] = entry
+        result['written' if written else 'unchanged'].append(entry['file'])
+
+    manifest_bytes = (json.dumps(manifest, ensure_ascii=False, indent=2, sort_keys=True)
+                      + '\n').encode('utf-8')
+    manifest_path = os.path.join(out_dir, MANIFEST_NAME)
+    try:
+        with open(manifest_path, 'rb') as f:
+            manifest_changed = f.read() != manifest_bytes
+    except OSError:
+        manifest_changed = True
+    if manifest_changed:
+        with open(manifest_path, 'wb') as f:
+            f.write(manifest_bytes)
+
+    result['manifest'] = manifest
+    result['manifest_changed'] = manifest_changed
+    return result
+
+
+def print_publish_report(out_dir: str, result: dict) -> None:
+    """배포 결과 출력"""
+    manifest = result['manifest']
+    pages = manifest['pages'].values()
+    total = sum(entry['size'] for entry in pages)
+    total_gzip = sum(entry.get('gzip_size', entry['size']) for entry in pages)
+
+    print("=" * 70)
+    print(f"🚀 배포 출력: {out_dir}")
+    print("=" * 70)
+    print(f"페이지: {len(manifest['pages'])}")
+    print(f"에셋: {len(manifest['assets'])}")
+    print(f"새로 기록: {len(result['written'])}")
+    print(f"변경 없음(건너뜀): {len(result['unchanged'])}")
+    print(f"manifest: {'갱신' if result['manifest_changed'] else '변경 없음'}")
+    if total:
+        print(f"페이지 크기: {total:,} bytes -> gzip {total_gzip:,} bytes "
+              f"({total_gzip / total:.0%})")
+    if result['errors']:
+        print(f"\n⚠️ 오류 발생 파일:")
+        for file_path, error in result['errors']:
+            print(f"  - {os.path.basename(file_path)}: {error}")
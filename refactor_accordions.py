@@ -9,17 +9,24 @@ HTML 파일들의 아코디언/FAQ 컴포넌트를 기본적으로 "펼쳐진 
 4. .kst-faq-item (단순 표시) - 변경 불필요
 """
 
+import argparse
 import os
 import re
 from pathlib import Path
 from typing import List, Tuple
 
+from budget import (DEFAULT_MEMORY_LIMIT_MB, BudgetRunner, budget_entry,
+                    describe_budget_failure, mark_rule, save_budget_quarantine)
+from html_verifier import introduced_issues
+from undo_journal import (JOURNAL_DIR, UndoJournal, commit_pending, diff_edits, file_hash,
+                          print_undo_report, undo_run)
+
 def find_html_files(root_dir: str) -> List[str]:
     """모든 HTML 파일 찾기"""
     html_files = []
     for root, dirs, files in os.walk(root_dir):
-        # .git 디렉토리 제외
-        if '.git' in root:
+        # .git, .kstation(저널/배포 출력) 디렉토리 제외
+        if '.git' in root or '.kstation' in root:
             continue
         for file in files:
             if file.endswith('.html'):
@@ -247,11 +254,16 @@ def fix_kst_faq_question_pattern(content: str) -> Tuple[str, int]:
     
     return content, count
 
-def process_file(file_path: str) -> dict:
-    """단일 파일 처리"""
+def process_file(file_path: str, journal: UndoJournal = None, write: bool = True) -> dict:
+    """단일 파일 처리 (journal이 있으면 수정 내역을 기록)
+
+    write 가 False 이면 저장하지 않고 편집 목록과 전후 해시를 담은 'pending' 결과를
+    돌려줍니다 (예산 작업자용, 부모가 commit_pending 으로 반영).
+    """
     try:
-        with open(file_path, 'r', encoding='utf-8') as f:
-            content = f.read()
+        with open(file_path, 'rb') as f:
+            original_bytes = f.read()
+        content = original_bytes.decode('utf-8')
         
         original_content = content
         stats = {
@@ -262,15 +274,44 @@ def process_file(file_path: str) -> dict:
         }
         
         # 패턴별 수정
+        mark_rule('details')
         content, stats['details'] = fix_details_tags(content)
+        mark_rule('ac_items')
         content, stats['ac_items'] = fix_kst_ac_items(content)
+        mark_rule('faq_items')
         content, stats['faq_items'] = fix_kst_faq_items(content)
+        mark_rule('faq_question')
         content, stats['faq_question'] = fix_kst_faq_question_pattern(content)
         
+        # 쓰기 전에 구조 검증 - 수정으로 구조가 깨진 파일은 저장하지 않고 격리
+        if content != original_content:
+            mark_rule('verify')
+            issues = introduced_issues(original_content, content)
+            if issues:
+                return {
+                    'modified': False,
+                    'quarantined': True,
+                    'issues': issues,
+                    'stats': stats
+                }
+        
         # 변경사항이 있으면 파일 저장
         if content != original_content:
-            with open(file_path, 'w', encoding='utf-8') as f:
-                f.write(content)
+            new_bytes = content.encode('utf-8')
+            if not write:
+                return {
+                    'modified': True,
+                    'pending': True,
+                    'stats': stats,
+                    'edits': diff_edits(original_bytes, new_bytes),
+                    'pre_hash': file_hash(original_bytes),
+                    'post_hash': file_hash(new_bytes)
+                }
+            mark_rule('write')
+            if journal is not None:
+                journal.record(file_path, original_bytes, new_bytes)
+            with open(file_path, 'wb') as f:
+                f.write(new_bytes)
             return {'modified': True, 'stats': stats}
         else:
             return {'modified': False, 'stats': stats}
@@ -278,8 +319,45 @@ def process_file(file_path: str) -> dict:
     except Exception as e:
         return {'modified': False, 'error': str(e)}
 
+def process_task(task: tuple) -> dict:
+    """예산 작업자에서 실행하는 단일 파일 처리 (파일은 쓰지 않음)"""
+    file_path, = task
+    return process_file(file_path, None, write=False)
+
+def process_file_budgeted(budget: BudgetRunner, file_path: str,
+                          journal: UndoJournal = None) -> dict:
+    """예산 작업자로 process_file 실행 - 저널 기록과 저장은 부모에서"""
+    result = budget.submit((file_path,))
+    if 'budget_exceeded' in result:
+        return {'modified': False, 'budget': budget_entry(file_path, result)}
+    if result.get('pending'):
+        try:
+            return commit_pending(file_path, result, journal)
+        except OSError as e:
+            return {'modified': False, 'error': str(e)}
+    return result
+
 def main():
     """메인 함수"""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument('--undo', metavar='RUN_ID',
+                        help='저널을 이용해 지정한 실행의 수정 내역을 되돌립니다')
+    parser.add_argument('--time-limit', metavar='SECONDS', type=float,
+                        help='파일당 처리 시간 예산 - 넘기면 작업자를 교체하고 파일 격리')
+    parser.add_argument('--memory-limit', metavar='MB', type=int,
+                        help=f'파일당 작업자 메모리 예산 (기본: {DEFAULT_MEMORY_LIMIT_MB})')
+    args = parser.parse_args()
+    journal_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), JOURNAL_DIR)
+    
+    if args.undo:
+        try:
+            result = undo_run(journal_dir, args.undo)
+        except FileNotFoundError as e:
+            print(f"❌ {e}")
+            return
+        print_undo_report(args.undo, result)
+        return
+    
     root_dir = os.path.dirname(os.path.abspath(__file__))
     html_files = find_html_files(root_dir)
     
@@ -296,13 +374,32 @@ def main():
     }
     modified_files = []
     error_files = []
+    quarantined_files = []
+    
+    journal = UndoJournal(journal_dir)
+    budget = None
+    budget_exceeded = []
+    if args.time_limit or args.memory_limit:
+        budget = BudgetRunner(process_task, args.time_limit or float('inf'),
+                              args.memory_limit or DEFAULT_MEMORY_LIMIT_MB)
     
     for file_path in html_files:
-        result = process_file(file_path)
+        if budget is not None:
+            result = process_file_budgeted(budget, file_path, journal)
+        else:
+            result = process_file(file_path, journal)
         
-        if 'error' in result:
+        if 'budget' in result:
+            description = describe_budget_failure(result['budget'])
+            budget_exceeded.append(result['budget'])
+            quarantined_files.append((file_path, [description]))
+            print(f"⏱️ 격리: {os.path.basename(file_path)} - {description}")
+        elif 'error' in result:
             error_files.append((file_path, result['error']))
             print(f"❌ 오류: {os.path.basename(file_path)} - {result['error']}")
+        elif result.get('quarantined'):
+            quarantined_files.append((file_path, result['issues']))
+            print(f"🚧 격리: {os.path.basename(file_path)} - 구조 검증 실패 {len(result['issues'])}건")
         elif result['modified']:
             modified_files.append(file_path)
             stats = result['stats']
@@ -328,6 +425,9 @@ def main():
     print(f"총 파일 수: {len(html_files)}")
     print(f"수정된 파일: {len(modified_files)}")
     print(f"오류 발생: {len(error_files)}")
+    print(f"격리된 파일: {len(quarantined_files)}")
+    if journal.entries:
+        print(f"되돌리기: python {os.path.basename(__file__)} --undo {journal.run_id}")
     print(f"\n총 변경 사항:")
     print(f"  - <details> 태그: {total_stats['details']}개")
     print(f"  - .kst-ac-item: {total_stats['ac_items']}개")
@@ -338,6 +438,20 @@ def main():
         print(f"\n⚠️ 오류 발생 파일:")
         for file_path, error in error_files:
             print(f"  - {os.path.basename(file_path)}: {error}")
+    
+    if quarantined_files:
+        print(f"\n🚧 격리된 파일 (저장하지 않음):")
+        for file_path, issues in quarantined_files:
+            print(f"  - {os.path.basename(file_path)}:")
+            for issue in issues:
+                print(f"      {issue}")
+    
+    if budget is not None:
+        budget.close()
+        if budget_exceeded:
+            quarantine_path = save_budget_quarantine(budget_exceeded, root_dir, journal.run_id)
+            print(f"\n⏱️ 예산 초과 {len(budget_exceeded)}개 "
+                  f"(작업자 교체 {budget.replaced}회): {quarantine_path}")
 
 if __name__ == '__main__':
     main()
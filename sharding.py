@@ -0,0 +1,165 @@
+#!/usr/bin/env python3
+"""
+여러 머신/컨테이너에서 나누어 실행하기 위한 결정적 샤딩과 통계 병합
+
+- 파일 목록은 루트 기준 상대 경로의 해시로 나누므로, 실행 순서나 머신과 관계없이
+  같은 파일은 항상 같은 샤드에 배정됩니다.
+- 각 샤드는 통계 산출물(JSON)을 남기고, merge 명령이 이를 합쳐 한 번에 실행했을
+  때와 같은 요약을 만듭니다.
+"""
+
+import hashlib
+import json
+import os
+from typing import List, Tuple
+
+# 샤드 통계 산출물 기본 저장 위치 (루트 폴더 기준)
+STATS_DIR = os.path.join('.kstation', 'stats')
+
+ARTIFACT_VERSION = 1
+
+ARTIFACT_KEYS = ('run_id', 'shard', 'profiles', 'total_files', 'profile_files', 'total_stats',
+                 'modified_files', 'error_files', 'quarantined_files')
+
+
+def parse_shard(value: str) -> Tuple[int, int]:
+    """'i/N' 형식 해석 (i 는 1부터 N 까지)"""
+    try:
+        index, count = (int(part) for part in value.split('/'))
+    except ValueError:
+        raise ValueError(f"샤드 형식이 잘못되었습니다 (예: 1/4): {value}")
+    if count < 1 or not 1 <= index <= count:
+        raise ValueError(f"샤드 번호는 1 이상 {max(count, 1)} 이하여야 합니다: {value}")
+    return index, count
+
+
+def shard_key(file_path: str, root_dir: str) -> str:
+    """머신에 관계없이 같은 값이 나오는 파일 키 (슬래시 구분 상대 경로)"""
+    return os.path.relpath(file_path, root_dir).replace(os.sep, '/')
+
+
+def shard_of(file_path: str, root_dir: str, count: int) -> int:
+    """파일이 속한 샤드 번호 (1부터)"""
+    digest = hashlib.sha1(shard_key(file_path, root_dir).encode('utf-8')).digest()
+    return int.from_bytes(digest[:8], 'big') % count + 1
+
+
+def shard_files(html_files: List[str], root_dir: str, shard: Tuple[int, int]) -> List[str]:
+    """지정한 샤드에 속한 파일만 남김"""
+    index, count = shard
+    return [path for path in html_files if shard_of(path, root_dir, count) == index]
+
+
+def summary_to_artifact(summary: dict, root_dir: str, shard: Tuple[int, int],
+                        profiles: List[str], run_id: str) -> dict:
+    """run() 요약을 머신 간에 옮길 수 있는 산출물로 변환 (경로는 상대 경로)"""
+    return {
+        'version': ARTIFACT_VERSION,
+        'run_id': run_id,
+        'shard': list(shard),
+        'profiles': profiles,
+        'total_files': summary['total_files'],
+        'profile_files': summary['profile_files'],
+        'total_stats': summary['total_stats'],
+        'modified_files': [shard_key(path, root_dir) for path in summary['modified_files']],
+        'error_files': [
+            [shard_key(path, root_dir), error] for path, error in summary['error_files']
+        ],
+        'quarantined_files': [
+            [shard_key(path, root_dir), issues]
+            for path, issues in summary['quarantined_files']
+        ],
+    }
+
+
+def write_artifact(artifact: dict, output_path: str) -> None:
+    """샤드 통계 산출물 저장"""
+    directory = os.path.dirname(os.path.abspath(output_path))
+    os.makedirs(directory, exist_ok=True)
+    with open(output_path, 'w', encoding='utf-8') as f:
+        json.dump(artifact, f, ensure_ascii=False, indent=2)
+
+
+def load_artifact(path: str) -> dict:
+    """샤드 통계 산출물 읽기"""
+    with open(path, 'r', encoding='utf-8') as f:
+        try:
+            artifact = json.load(f)
+        except ValueError as e:
+            raise ValueError(f"산출물 JSON 을 읽을 수 없습니다 ({e}): {path}")
+    if not isinstance(artifact, dict) or artifact.get('version') != ARTIFACT_VERSION:
+        raise ValueError(f"지원하지 않는 산출물 버전입니다: {path}")
+    missing = [key for key in ARTIFACT_KEYS if key not in artifact]
+    if missing:
+        raise ValueError(f"산출물에 필요한 항목이 없습니다 ({', '.join(missing)}): {path}")
+    return artifact
+
+
+def merge_artifacts(artifacts: List[dict]) -> Tuple[dict, List[str]]:
+    """샤드 산출물을 합쳐 단일 실행과 같은 요약 생성
+
+    반환값: (요약, 경고 목록) - 빠진 샤드, 프로파일 불일치는 경고로 보고
+
+    같은 실행의 같은 샤드 산출물(shard, run_id)이 여러 번 주어지면 한 번만 합치고,
+    서로 다른 실행의 같은 샤드가 섞여 있으면 어느 쪽이 맞는지 알 수 없으므로
+    ValueError 를 냅니다 (합계가 단일 실행과 달라지지 않도록).
+    """
+    warnings = []
+    summary = {
+        'total_files': 0,
+        'profile_files': {},
+        'total_stats': {},
+        'modified_files': [],
+        'error_files': [],
+        'quarantined_files': [],
+    }
+    if not artifacts:
+        return summary, ['병합할 산출물이 없습니다']
+
+    unique = {}
+    for artifact in artifacts:
+        key = (tuple(artifact['shard']), artifact['run_id'])
+        if key in unique:
+            warnings.append(f"중복된 산출물은 한 번만 병합: 샤드 {key[0][0]}/{key[0][1]} "
+                            f"(실행 {key[1]})")
+            continue
+        unique[key] = artifact
+    artifacts = list(unique.values())
+
+    counts = {artifact['shard'][1] for artifact in artifacts}
+    if len(counts) > 1:
+        warnings.append(f"샤드 개수가 서로 다릅니다: {sorted(counts)}")
+    profile_sets = {tuple(artifact['profiles']) for artifact in artifacts}
+    if len(profile_sets) > 1:
+        warnings.append(f"프로파일이 서로 다릅니다: {sorted(profile_sets)}")
+
+    seen = {}
+    for artifact in artifacts:
+        shard = tuple(artifact['shard'])
+        seen[shard] = seen.get(shard, 0) + 1
+    for count in counts:
+        missing = [index for index in range(1, count + 1) if (index, count) not in seen]
+        if missing:
+            warnings.append(f"빠진 샤드: {', '.join(f'{i}/{count}' for i in missing)}")
+    duplicated = [shard for shard, times in sorted(seen.items()) if times > 1]
+    if duplicated:
+        raise ValueError(f"서로 다른 실행의 같은 샤드가 있습니다: "
+                         f"{', '.join(f'{i}/{n}' for i, n in duplicated)}")
+
+    for artifact in artifacts:
+        summary['total_files'] += artifact['total_files']
+        for profile, count in artifact['profile_files'].items():
+            summary['profile_files'][profile] = summary['profile_files'].get(profile, 0) + count
+        for key, value in artifact['total_stats'].items():
+            summary['total_stats'][key] = summary['total_stats'].get(key, 0) + value
+        summary['modified_files'].extend(artifact['modified_files'])
+        summary['error_files'].extend(tuple(item) for item in artifact['error_files'])
+        summary['quarantined_files'].extend(
+            tuple(item) for item in artifact['quarantined_files']
+        )
+
+    # 단일 실행과 같은 순서(정렬된 파일 목록)로 정리
+    summary['modified_files'].sort()
+    summary['error_files'].sort()
+    summary['quarantined_files'].sort()
+    return summary, warnings
@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+콘텐츠 주소 기반 변환 결과 캐시
+
+키는 (규칙 버전, 원본 내용 해시) 입니다. 값은 변환 결과 전체가 아니라 통계, 구조 문제,
+바이트 편집 구간(undo 저널과 같은 형식)이라 작고, 같은 문서가 몇 번 나오든 규칙은
+한 번만 적용됩니다. 이미 처리된 페이지처럼 바뀌지 않는 문서는 빈 편집 목록으로
+저장되어 다음 실행에서 바로 건너뜁니다.
+
+저장 위치: .kstation/cache/<규칙 버전>/<해시 앞 2자리>/<해시>.json
+"""
+
+import base64
+import hashlib
+import json
+import os
+from typing import Dict, List, Optional, Tuple
+
+# 루트 폴더 기준 기본 캐시 위치
+CACHE_DIR = os.path.join('.kstation', 'cache')
+
+
+def apply_edits(data: bytes, edits: List[Tuple[int, bytes, bytes]]) -> bytes:
+    """(수정 후 오프셋, 이전 바이트, 새 바이트) 편집 목록을 원본에 적용"""
+    parts = []
+    pos = 0
+    delta = 0
+    for offset, old_bytes, new_bytes in edits:
+        old_offset = offset - delta
+        parts.append(data[pos:old_offset])
+        parts.append(new_bytes)
+        pos = old_offset + len(old_bytes)
+        delta += len(new_bytes) - len(old_bytes)
+    parts.append(data[pos:])
+    return b''.join(parts)
+
+
+class TransformCache:
+    """디스크 + 메모리 2단 변환 결과 캐시"""
+
+    def __init__(self, cache_dir: str):
+        self.cache_dir = cache_dir
+        self.memory: Dict[Tuple[str, str], dict] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def _path(self, version: str, key: str) -> str:
+        return os.path.join(self.cache_dir, version, key[:2], key + '.json')
+
+    def get(self, version: str, key: str) -> Optional[dict]:
+        """캐시 항목 조회 (edits 는 bytes 로 복원)"""
+        entry = self.memory.get((version, key))
+        if entry is None:
+            try:
+                with open(self._path(version, key), 'r', encoding='utf-8') as f:
+                    stored = json.load(f)
+            except (OSError, ValueError):
+                self.misses += 1
+                return None
+            entry = {
+                'stats': stored['stats'],
+                'issues': stored['issues'],
+                'post_hash': stored['post_hash'],
+                'edits': [
+                    (offset, base64.b64decode(old_b64), base64.b64decode(new_b64))
+                    for offset, old_b64, new_b64 in stored['edits']
+                ],
+            }
+            self.memory[(version, key)] = entry
+        self.hits += 1
+        return entry
+
+    def put(self, version: str, key: str, stats: Dict[str, int], issues: List[str],
+            edits: List[Tuple[int, bytes, bytes]], post_hash: str) -> None:
+        """캐시 항목 저장"""
+        entry = {'stats': stats, 'issues': issues, 'post_hash': post_hash, 'edits': edits}
+        self.memory[(version, key)] = entry
+        stored = dict(entry, edits=[
+            [offset,
+             base64.b64encode(old_bytes).decode('ascii'),
+             base64.b64encode(new_bytes).decode('ascii')]
+            for offset, old_bytes, new_bytes in edits
+        ])
+        path = self._path(version, key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temp_path = path + '.tmp'
+        with open(temp_path, 'w', encoding='utf-8') as f:
+            json.dump(stored, f, ensure_ascii=False)
+        os.replace(temp_path, path)
+
+
+def content_key(data: bytes) -> str:
+    """캐시 키로 쓰는 원본 내용 해시"""
+    return hashlib.sha256(data).hexdigest()
@@ -0,0 +1,218 @@
+#!/usr/bin/env python3
+"""
+수정 실행(run) 단위의 압축 되돌리기 저널
+
+파일 전체를 백업하지 않고, 바뀐 바이트 구간만 (오프셋, 이전 바이트, 새 바이트)로
+기록합니다. 각 항목은 수정 전 파일 해시를 키로 가지며, --undo <run-id> 로
+저널을 역순으로 재생해 실행 전 상태로 되돌립니다.
+
+저널 형식 (JSON Lines, 파일당 한 줄):
+{"pre_hash": ..., "post_hash": ..., "path": ..., "edits": [[offset, old_b64, new_b64], ...]}
+- offset 은 수정 후 파일 기준 위치
+"""
+
+import base64
+import difflib
+import hashlib
+import json
+import os
+import re
+import tempfile
+import time
+from typing import Dict, List, Tuple
+
+from transform_cache import apply_edits
+
+# 스크립트 폴더 기준 저널 저장 위치
+JOURNAL_DIR = os.path.join('.kstation', 'journal')
+
+# 바뀐 줄 안을 다시 나누는 단위 ('<' 로 시작하는 조각과 그 앞 텍스트) - 한 줄로 된
+# minified 페이지도 태그 단위로 비교해, 멀리 떨어진 수정이 한 편집으로 합쳐지지 않게 함
+FRAGMENT_PATTERN = re.compile(rb'<[^<]*|[^<]+')
+
+
+def new_run_id() -> str:
+    """실행 ID 생성 (시각 + 임의 접미사)"""
+    return time.strftime('%Y%m%d-%H%M%S') + '-' + os.urandom(2).hex()
+
+
+def file_hash(data: bytes) -> str:
+    """파일 내용 해시"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def _trim_common(old: bytes, new: bytes) -> Tuple[int, int]:
+    """공통 접두/접미 길이 계산"""
+    limit = min(len(old), len(new))
+    prefix = 0
+    while prefix < limit and old[prefix] == new[prefix]:
+        prefix += 1
+    suffix = 0
+    while (suffix < limit - prefix
+           and old[len(old) - 1 - suffix] == new[len(new) - 1 - suffix]):
+        suffix += 1
+    return prefix, suffix
+
+
+def _diff_pieces(old_pieces: List[bytes], new_pieces: List[bytes], base: int,
+                 autojunk: bool = False) -> List[Tuple[int, bytes, bytes]]:
+    """조각 목록 사이의 바뀐 구간 (new 기준 오프셋, 이전 바이트, 새 바이트)"""
+    matcher = difflib.SequenceMatcher(None, old_pieces, new_pieces, autojunk=autojunk)
+    # 조각 단위 오프셋 누적표
+    new_offsets = [base]
+    for piece in new_pieces:
+        new_offsets.append(new_offsets[-1] + len(piece))
+
+    changes = []
+    for tag, i1, i2, j1, j2 in matcher.get_opcodes():
+        if tag == 'equal':
+            continue
+        changes.append((new_offsets[j1], b''.join(old_pieces[i1:i2]),
+                        b''.join(new_pieces[j1:j2])))
+    return changes
+
+
+def diff_edits(old: bytes, new: bytes) -> List[Tuple[int, bytes, bytes]]:
+    """두 바이트열 사이의 최소 편집 구간 목록 (오프셋은 new 기준)
+
+    줄 단위로 먼저 비교하고, 바뀐 줄 묶음 안은 태그 조각 단위로 다시 비교한 뒤
+    조각마다 실제로 다른 바이트만 남깁니다. 조각 비교에서는 '</div>' 처럼 아주 흔한
+    조각을 기준점에서 빼야 (autojunk) 큰 한 줄 페이지에서도 제곱 시간이 걸리지 않습니다.
+    """
+    edits = []
+    for offset, old_chunk, new_chunk in _diff_pieces(
+            old.splitlines(keepends=True), new.splitlines(keepends=True), 0):
+        for start, old_part, new_part in _diff_pieces(
+                FRAGMENT_PATTERN.findall(old_chunk), FRAGMENT_PATTERN.findall(new_chunk),
+                offset, autojunk=True):
+            prefix, suffix = _trim_common(old_part, new_part)
+            edits.append((
+                start + prefix,
+                old_part[prefix:len(old_part) - suffix],
+                new_part[prefix:len(new_part) - suffix]
+            ))
+    return edits
+
+
+class UndoJournal:
+    """한 번의 실행에서 발생한 수정 내역 기록기"""
+
+    def __init__(self, journal_dir: str, run_id: str = None):
+        self.run_id = run_id or new_run_id()
+        os.makedirs(journal_dir, exist_ok=True)
+        self.path = os.path.join(journal_dir, f'{self.run_id}.jsonl')
+        self.entries = 0
+
+    def record(self, file_path: str, old: bytes, new: bytes) -> None:
+        """파일 하나의 수정 내역 추가 (파일을 쓰기 전에 호출)"""
+        self.record_edits(file_path, file_hash(old), file_hash(new), diff_edits(old, new))
+
+    def record_edits(self, file_path: str, pre_hash: str, post_hash: str,
+                     edits: List[Tuple[int, bytes, bytes]]) -> None:
+        """편집 구간을 이미 알고 있는 경우 바로 기록 (오프셋은 수정 후 기준)"""
+        entry = {
+            'pre_hash': pre_hash,
+            'post_hash': post_hash,
+            'path': os.path.abspath(file_path),
+            'edits': [
+                [offset,
+                 base64.b64encode(old_bytes).decode('ascii'),
+                 base64.b64encode(new_bytes).decode('ascii')]
+                for offset, old_bytes, new_bytes in edits
+            ]
+        }
+        # 실행 도중 중단되어도 그때까지의 기록은 남도록 항목마다 추가 기록
+        with open(self.path, 'a', encoding='utf-8') as f:
+            f.write(json.dumps(entry, ensure_ascii=False) + '\n')
+        self.entries += 1
+
+
+def write_atomic(file_path: str, data: bytes) -> None:
+    """같은 폴더의 임시 파일에 기록 후 교체 (중간에 끊겨도 반쯤 쓰인 파일이 남지 않음)"""
+    directory = os.path.dirname(os.path.abspath(file_path))
+    mode = os.stat(file_path).st_mode
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix='.kstation-', suffix='.tmp')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(temp_path, mode)
+        os.replace(temp_path, file_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def commit_pending(file_path: str, result: dict, journal: UndoJournal = None) -> dict:
+    """저장하지 않은 수정 결과('pending')를 저널에 기록하고 원자적으로 저장
+
+    예산 작업자는 파일을 쓰지 않고 편집 목록과 전후 해시만 돌려주므로 부모가 이 함수로
+    반영합니다. 파일이 그 사이 바뀌었으면 (pre_hash 불일치) 저장하지 않고 오류로 돌려줍니다.
+    """
+    with open(file_path, 'rb') as f:
+        original_bytes = f.read()
+    if file_hash(original_bytes) != result['pre_hash']:
+        return {'modified': False, 'error': '처리 중 파일이 변경됨'}
+    new_bytes = apply_edits(original_bytes, result['edits'])
+    if file_hash(new_bytes) != result['post_hash']:
+        return {'modified': False, 'error': '편집 적용 결과 해시 불일치'}
+    if journal is not None:
+        journal.record_edits(file_path, result['pre_hash'], result['post_hash'],
+                             result['edits'])
+    write_atomic(file_path, new_bytes)
+    return {'modified': True, 'stats': result['stats'], 'edits': result['edits'],
+            'post_hash': result['post_hash']}
+
+
+def undo_run(journal_dir: str, run_id: str) -> Dict[str, list]:
+    """저널을 역순으로 재생해 실행을 되돌림"""
+    journal_path = os.path.join(journal_dir, f'{run_id}.jsonl')
+    if not os.path.exists(journal_path):
+        raise FileNotFoundError(f"저널을 찾을 수 없습니다: {journal_path}")
+
+    with open(journal_path, 'r', encoding='utf-8') as f:
+        entries = [json.loads(line) for line in f if line.strip()]
+
+    result = {'reverted': [], 'skipped': []}
+    for entry in reversed(entries):
+        file_path = entry['path']
+        try:
+            with open(file_path, 'rb') as f:
+                data = f.read()
+        except OSError as e:
+            result['skipped'].append((file_path, str(e)))
+            continue
+
+        # 실행 이후 다시 바뀐 파일은 건드리지 않음
+        if file_hash(data) != entry['post_hash']:
+            result['skipped'].append((file_path, '실행 이후 파일이 변경됨'))
+            continue
+
+        buffer = bytearray(data)
+        for offset, old_b64, new_b64 in reversed(entry['edits']):
+            old_bytes = base64.b64decode(old_b64)
+            new_bytes = base64.b64decode(new_b64)
+            buffer[offset:offset + len(new_bytes)] = old_bytes
+
+        if file_hash(bytes(buffer)) != entry['pre_hash']:
+            result['skipped'].append((file_path, '복원 결과 해시 불일치'))
+            continue
+
+        with open(file_path, 'wb') as f:
+            f.write(buffer)
+        result['reverted'].append(file_path)
+
+    return result
+
+
+def print_undo_report(run_id: str, result: Dict[str, list]) -> None:
+    """되돌리기 결과 출력"""
+    print("=" * 60)
+    print(f"↩️  실행 되돌리기: {run_id}")
+    print("=" * 60)
+    for file_path in result['reverted']:
+        print(f"✅ {os.path.basename(file_path)}")
+    for file_path, reason in result['skipped']:
+        print(f"⚠️ 건너뜀: {os.path.basename(file_path)} - {reason}")
+    print(f"\n복원된 파일: {len(result['reverted'])}")
+    print(f"건너뛴 파일: {len(result['skipped'])}")